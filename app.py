@@ -1,10 +1,23 @@
 import streamlit as st
-import time
-import zipfile
-import tempfile
 import os
-from datetime import datetime
-from jinja2 import Template
+
+from securerag.cache import create_kit_cache
+from securerag.config import SIZING_DEFAULTS, KitConfig
+from securerag.ingestion import PII_DATA
+from securerag.jobs import KitJobManager
+from securerag.labels import (
+    DATA_TYPE_CHOICES, LEVEL_BADGES, OBJECTIVE_CHOICES, PRIORITY_LABELS, RISK_LABELS, SECURITY_CHOICES,
+    REGION_LABELS, TOPOLOGY_LABELS, VECTORIZER_LABELS
+)
+from securerag import resources
+from securerag.metrics import metrics, serve as serve_metrics
+from securerag.provisioning import AZURE_REGIONS, REGION_COUNTS
+from securerag.resources import read_static
+from securerag.summary import generate_config_summary
+from securerag.sizing import (
+    EMBEDDING_DIMS, LATENCY_TARGETS_MS, MAX_CORPUS_SIZE, NODE_MEMORY_GB, REPLICATION_FACTORS, TOPOLOGIES
+)
+from securerag.vectorizers import TRANSFORMERS_DIM, VECTORIZERS
 
 # Configuration de la page
 st.set_page_config(
@@ -14,79 +27,15 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+@st.cache_resource
+def load_css():
+    """Feuille de style, lue une seule fois et partagée entre toutes les sessions"""
+    css = f"<style>\n{read_static('app.css')}</style>"
+    resources.register('css', lambda: {'entries': 1, 'bytes': len(css)})
+    return css
+
 # CSS personnalisé
-st.markdown("""
-<style>
-    .main-header {
-        text-align: center;
-        padding: 2rem 0;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 1rem;
-        margin-bottom: 2rem;
-    }
-    
-    .step-card {
-        background: white;
-        padding: 2rem;
-        border-radius: 1rem;
-        box-shadow: 0 10px 25px rgba(0,0,0,0.1);
-        border: 1px solid #e5e7eb;
-        margin: 1rem 0;
-    }
-    
-    .step-icon {
-        font-size: 3rem;
-        text-align: center;
-        margin-bottom: 1rem;
-    }
-    
-    .progress-container {
-        background: white;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-    }
-    
-    .alert-warning {
-        background: #fef3c7;
-        border: 1px solid #f59e0b;
-        color: #92400e;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 1rem 0;
-    }
-    
-    .config-summary {
-        background: linear-gradient(135deg, #ddd6fe 0%, #e0e7ff 100%);
-        padding: 1.5rem;
-        border-radius: 0.75rem;
-        margin: 1rem 0;
-        white-space: pre-line;
-        font-family: monospace;
-    }
-    
-    /* Masquer le menu Streamlit */
-    #MainMenu {visibility: hidden;}
-    .stDeployButton {display:none;}
-    footer {visibility: hidden;}
-    
-    .stButton > button {
-        background: linear-gradient(135deg, #3b82f6 0%, #8b5cf6 100%);
-        color: white;
-        border: none;
-        border-radius: 0.5rem;
-        padding: 0.75rem 1.5rem;
-        font-weight: 600;
-        transition: all 0.3s;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(load_css(), unsafe_allow_html=True)
 
 # Fonctions utilitaires
 def init_session_state():
@@ -95,10 +44,25 @@ def init_session_state():
         st.session_state.current_step = 1
     if 'objective' not in st.session_state:
         st.session_state.objective = ''
+    # Sélections multiples : dict utilisé comme ensemble ordonné (ordre de sélection)
     if 'data_types' not in st.session_state:
-        st.session_state.data_types = []
+        st.session_state.data_types = {}
     if 'security_level' not in st.session_state:
-        st.session_state.security_level = []
+        st.session_state.security_level = {}
+    if 'sizing' not in st.session_state:
+        st.session_state.sizing = dict(SIZING_DEFAULTS)
+
+def update_selection(state_key, widget_key, value):
+    """Reporte l'état d'une case à cocher dans la sélection multiple correspondante"""
+    selection = st.session_state[state_key]
+    if st.session_state[widget_key]:
+        selection[value] = None
+    else:
+        selection.pop(value, None)
+
+def update_sizing(name, widget_key):
+    """Reporte la valeur d'un champ de dimensionnement dans l'état de session"""
+    st.session_state.sizing[name] = st.session_state[widget_key]
 
 def render_progress_bar(current_step, total_steps):
     """Affiche une barre de progression"""
@@ -122,240 +86,64 @@ def render_progress_bar(current_step, total_steps):
     </div>
     """, unsafe_allow_html=True)
 
-def generate_terraform_config(config):
-    """Génère la configuration Terraform"""
-    template = Template("""
-# Configuration Terraform pour RAG Sécurisé
-# Généré automatiquement par Secure RAG Kit Generator
-
-terraform {
-  required_version = ">= 1.0"
-  required_providers {
-    azurerm = {
-      source  = "hashicorp/azurerm"
-      version = "~> 3.0"
-    }
-  }
-}
-
-provider "azurerm" {
-  features {}
-}
-
-# Resource Group
-resource "azurerm_resource_group" "rag_rg" {
-  name     = "rg-secure-rag-{{ objective }}"
-  location = "West Europe"
-  
-  tags = {
-    Environment = "production"
-    Purpose     = "SecureRAG"
-    DataTypes   = "{{ data_types_str }}"
-  }
-}
-
-{% if 'encryption' in security_level %}
-# Key Vault pour la gestion des clés
-resource "azurerm_key_vault" "rag_kv" {
-  name                = "kv-secure-rag-${random_string.suffix.result}"
-  location            = azurerm_resource_group.rag_rg.location
-  resource_group_name = azurerm_resource_group.rag_rg.name
-  tenant_id          = data.azurerm_client_config.current.tenant_id
-  sku_name           = "premium"
-
-  enabled_for_deployment          = true
-  enabled_for_disk_encryption     = true
-  enabled_for_template_deployment = true
-}
-{% endif %}
-
-# Azure OpenAI Service
-resource "azurerm_cognitive_account" "openai" {
-  name                = "openai-secure-rag-${random_string.suffix.result}"
-  location            = azurerm_resource_group.rag_rg.location
-  resource_group_name = azurerm_resource_group.rag_rg.name
-  kind                = "OpenAI"
-  sku_name           = "S0"
-  
-  tags = {
-    Environment = "production"
-    DataSensitivity = "{{ data_sensitivity }}"
-  }
-}
-
-resource "random_string" "suffix" {
-  length  = 8
-  special = false
-  upper   = false
-}
-
-data "azurerm_client_config" "current" {}
-
-# Outputs
-output "resource_group_name" {
-  value = azurerm_resource_group.rag_rg.name
-}
-
-output "openai_endpoint" {
-  value = azurerm_cognitive_account.openai.endpoint
-  sensitive = true
-}
-""")
-    
-    data_sensitivity = "High" if any(dt in config.get('data_types', []) for dt in ['personal', 'financial', 'legal']) else "Medium"
-    
-    return template.render(
-        objective=config.get('objective', 'general'),
-        data_types_str=','.join(config.get('data_types', [])),
-        security_level=config.get('security_level', []),
-        data_sensitivity=data_sensitivity
+@st.cache_resource
+def get_kit_cache():
+    """Cache de kits partagé entre toutes les sessions"""
+    return create_kit_cache()
+
+@st.cache_resource
+def get_job_manager():
+    """Pool de génération en arrière-plan partagé entre toutes les sessions
+
+    Avec SECURE_RAG_SERVICE_URL, l'application n'est qu'un client du service HTTP
+    de génération (python -m securerag.service) ; sinon elle génère sur place.
+    """
+    service_url = os.environ.get('SECURE_RAG_SERVICE_URL')
+    if service_url:
+        # Import différé : requests n'est chargé qu'en mode client du service
+        from securerag.client import RemoteKitJobManager
+        return RemoteKitJobManager(service_url)
+    manager = KitJobManager(get_kit_cache(), max_workers=int(os.environ.get('SECURE_RAG_JOB_WORKERS', 4)))
+    metrics.register_gauges('kit_jobs', lambda: {'running': manager.running()})
+    return manager
+
+@st.cache_resource
+def start_metrics_server():
+    """Point d'accès de scraping des métriques, démarré une seule fois par processus"""
+    port = os.environ.get('SECURE_RAG_METRICS_PORT')
+    if not metrics.enabled or not port:
+        return None
+    return serve_metrics(metrics, int(port), os.environ.get('SECURE_RAG_METRICS_HOST', '127.0.0.1'))
+
+def get_session_config():
+    """Configuration du kit issue de l'état de session"""
+    return KitConfig(
+        objective=st.session_state.get('objective', ''),
+        data_types=st.session_state.get('data_types', ()),
+        security_level=st.session_state.get('security_level', ()),
+        **st.session_state.get('sizing', SIZING_DEFAULTS)
     )
 
-def generate_weaviate_config(config):
-    """Génère la configuration Weaviate"""
-    return f"""
-# Configuration Weaviate pour RAG Sécurisé
-version: '3.8'
-
-services:
-  weaviate:
-    image: semitechnologies/weaviate:latest
-    ports:
-      - "8080:8080"
-    environment:
-      QUERY_DEFAULTS_LIMIT: 25
-      AUTHENTICATION_ANONYMOUS_ACCESS_ENABLED: '{"false" if "sso" in config.get("security_level", []) else "true"}'
-      PERSISTENCE_DATA_PATH: '/var/lib/weaviate'
-      DEFAULT_VECTORIZER_MODULE: 'text2vec-openai'
-      ENABLE_MODULES: 'text2vec-openai,qna-openai'
-      OPENAI_APIKEY: '${{OPENAI_API_KEY}}'
-    volumes:
-      - weaviate_data:/var/lib/weaviate
-
-volumes:
-  weaviate_data:
-"""
-
-def generate_readme(config):
-    """Génère le README"""
-    objective_labels = {
-        'search': 'Moteur de recherche interne',
-        'assistant': 'Assistant conversationnel',
-        'synthesis': 'Génération de synthèses',
-        'analysis': 'Analyse de documents'
-    }
-    
-    data_type_labels = {
-        'hr': 'RH', 'legal': 'Juridique', 'financial': 'Financier',
-        'personal': 'Personnel', 'public': 'Public', 'technical': 'Technique'
-    }
-    
-    return f"""
-# 🚀 Secure RAG Kit - Configuration Personnalisée
-
-## 📋 Vue d'ensemble
-
-Ce kit contient une configuration complète et sécurisée pour déployer un système RAG.
-
-### 🎯 Configuration Générée
-
-- **Objectif** : {objective_labels.get(config.get('objective'), 'Non défini')}
-- **Types de données** : {', '.join([data_type_labels.get(dt, dt) for dt in config.get('data_types', [])])}
-- **Sécurité** : {', '.join(config.get('security_level', []))}
-
-## 📦 Contenu du Kit
-
-- 🏗️ main.tf - Infrastructure Terraform
-- 🗄️ weaviate-config.yaml - Configuration base vectorielle  
-- 📄 README.md - Guide d'utilisation
-
-## 🚀 Démarrage Rapide
-
-1. Configurer les variables d'environnement Azure
-2. Déployer avec Terraform : `terraform init && terraform apply`
-3. Lancer Weaviate : `docker-compose -f weaviate-config.yaml up -d`
-
-## 🛡️ Sécurité
-
-{'⚠️ Configuration avec données sensibles - Respectez les obligations RGPD' if any(dt in config.get('data_types', []) for dt in ['personal', 'financial']) else '✅ Configuration sécurisée standard'}
-
-## 📞 Support
-
-- Support technique : support@secure-rag-kit.com
-- Questions sécurité : security@secure-rag-kit.com
-
-*Généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')} par Secure RAG Kit Generator*
-"""
-
-def generate_secure_kit(config):
-    """Génère un kit RAG sécurisé"""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        files_generated = []
-        
-        # 1. Configuration Terraform
-        terraform_content = generate_terraform_config(config)
-        terraform_path = os.path.join(temp_dir, "main.tf")
-        with open(terraform_path, 'w', encoding='utf-8') as f:
-            f.write(terraform_content)
-        files_generated.append(("main.tf", terraform_path))
-        
-        # 2. Configuration Weaviate
-        weaviate_content = generate_weaviate_config(config)
-        weaviate_path = os.path.join(temp_dir, "weaviate-config.yaml")
-        with open(weaviate_path, 'w', encoding='utf-8') as f:
-            f.write(weaviate_content)
-        files_generated.append(("weaviate-config.yaml", weaviate_path))
-        
-        # 3. README
-        readme_content = generate_readme(config)
-        readme_path = os.path.join(temp_dir, "README.md")
-        with open(readme_path, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
-        files_generated.append(("README.md", readme_path))
-        
-        # Créer le fichier ZIP
-        zip_path = os.path.join(temp_dir, "secure-rag-kit.zip")
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for filename, filepath in files_generated:
-                zipf.write(filepath, filename)
-        
-        # Lire le contenu du ZIP
-        with open(zip_path, 'rb') as f:
-            zip_content = f.read()
-        
-        return zip_content
+def start_kit_job():
+    """Lance, ou rejoint, la génération du kit pour la configuration courante
+
+    Un job lancé pour une configuration devenue obsolète est abandonné ; un job
+    en échec est relancé, pour que l'utilisateur puisse réessayer.
+    """
+    config = get_session_config()
+    job = st.session_state.get('kit_job')
+    if job is not None:
+        failed = job.done() and job.exception() is not None
+        if job.key == config.key and not job.cancelled() and not failed:
+            return job
+        get_job_manager().release(job)
+    job = get_job_manager().submit(config)
+    st.session_state.kit_job = job
+    return job
 
 def get_config_summary():
     """Génère un résumé de la configuration"""
-    summary = "🎯 Configuration personnalisée :\n\n"
-    
-    objective_map = {
-        'search': '✅ Moteur de recherche interne optimisé',
-        'assistant': '✅ Assistant conversationnel intelligent',
-        'synthesis': '✅ Générateur de synthèses automatique',
-        'analysis': '✅ Analyseur de documents avancé'
-    }
-    
-    if st.session_state.get('objective'):
-        summary += objective_map.get(st.session_state.objective, '') + '\n'
-    
-    data_types = st.session_state.get('data_types', [])
-    if 'personal' in data_types:
-        summary += '✅ Protection données personnelles (RGPD)\n'
-    if 'financial' in data_types:
-        summary += '✅ Conformité financière renforcée\n'
-    
-    security = st.session_state.get('security_level', [])
-    if 'encryption' in security:
-        summary += '✅ Chiffrement bout-en-bout activé\n'
-    if 'sso' in security:
-        summary += '✅ Authentification SSO configurée\n'
-    if 'audit' in security:
-        summary += '✅ Journalisation complète des accès\n'
-    
-    summary += '\n✅ Configuration sécurisée prête pour déploiement'
-    
-    return summary
+    return generate_config_summary(get_session_config())
 
 # Pages du wizard
 def render_welcome():
@@ -382,7 +170,7 @@ def render_welcome():
             st.rerun()
 
 def render_objective():
-    render_progress_bar(1, 4)
+    render_progress_bar(1, 5)
     
     st.markdown("""
     <div class="step-card">
@@ -392,14 +180,7 @@ def render_objective():
     </div>
     """, unsafe_allow_html=True)
     
-    objectives = [
-        {"value": "search", "label": "🔍 Moteur de recherche interne", "desc": "Rechercher dans documents et bases de connaissances"},
-        {"value": "assistant", "label": "🤖 Assistant conversationnel métier", "desc": "RH, finance, support client..."},
-        {"value": "synthesis", "label": "📝 Génération de synthèses", "desc": "Résumés, rapports, documentation"},
-        {"value": "analysis", "label": "📊 Analyse de documents", "desc": "Contrats, PDF, données non-structurées"}
-    ]
-    
-    for obj in objectives:
+    for obj in OBJECTIVE_CHOICES:
         if st.button(f"{obj['label']}\n{obj['desc']}", key=obj['value'], use_container_width=True):
             st.session_state.objective = obj['value']
             st.rerun()
@@ -416,7 +197,7 @@ def render_objective():
             st.rerun()
 
 def render_data_types():
-    render_progress_bar(2, 4)
+    render_progress_bar(2, 5)
     
     st.markdown("""
     <div class="step-card">
@@ -426,30 +207,27 @@ def render_data_types():
     </div>
     """, unsafe_allow_html=True)
     
-    data_types = [
-        {"value": "hr", "label": "👥 RH", "desc": "Fiches de poste, CV, entretiens", "risk": "medium"},
-        {"value": "legal", "label": "⚖️ Juridique", "desc": "Contrats, politiques internes", "risk": "high"},
-        {"value": "financial", "label": "💰 Financier", "desc": "Budgets, bilans, projections", "risk": "high"},
-        {"value": "personal", "label": "🔒 Données personnelles", "desc": "Emails, noms, adresses...", "risk": "high"},
-        {"value": "public", "label": "🌐 Données publiques", "desc": "Documentation, FAQ, guides", "risk": "low"},
-        {"value": "technical", "label": "⚙️ Technique", "desc": "Code, configurations, logs", "risk": "medium"}
-    ]
-    
+    render_data_types_options()
+
+@st.fragment
+def render_data_types_options():
+    """Cases à cocher et navigation : un clic ne réexécute que ce fragment"""
     col1, col2 = st.columns(2)
     
-    for i, dtype in enumerate(data_types):
+    for i, dtype in enumerate(DATA_TYPE_CHOICES):
         with col1 if i % 2 == 0 else col2:
             is_selected = dtype['value'] in st.session_state.data_types
             
-            risk_color = {"high": "🔴", "medium": "🟡", "low": "🟢"}[dtype['risk']]
-            risk_text = {"high": "Sensible", "medium": "Modéré", "low": "Public"}[dtype['risk']]
+            risk_color = LEVEL_BADGES[dtype['risk']]
+            risk_text = RISK_LABELS[dtype['risk']]
             
-            if st.checkbox(f"{dtype['label']} {risk_color}", value=is_selected, key=f"data_{dtype['value']}"):
-                if dtype['value'] not in st.session_state.data_types:
-                    st.session_state.data_types.append(dtype['value'])
-            else:
-                if dtype['value'] in st.session_state.data_types:
-                    st.session_state.data_types.remove(dtype['value'])
+            st.checkbox(
+                f"{dtype['label']} {risk_color}",
+                value=is_selected,
+                key=f"data_{dtype['value']}",
+                on_change=update_selection,
+                args=('data_types', f"data_{dtype['value']}", dtype['value'])
+            )
             
             st.caption(f"{dtype['desc']} - {risk_text}")
     
@@ -474,7 +252,7 @@ def render_data_types():
             st.rerun()
 
 def render_security():
-    render_progress_bar(3, 4)
+    render_progress_bar(3, 5)
     
     st.markdown("""
     <div class="step-card">
@@ -484,30 +262,27 @@ def render_security():
     </div>
     """, unsafe_allow_html=True)
     
-    security_options = [
-        {"value": "sso", "label": "🔑 Authentification SSO", "desc": "Azure AD, Google, SAML", "priority": "high"},
-        {"value": "audit", "label": "📋 Journalisation des accès", "desc": "Logs auditables et traçabilité", "priority": "high"},
-        {"value": "encryption", "label": "🔒 Chiffrement au repos", "desc": "KMS, Vault, clés rotatives", "priority": "high"},
-        {"value": "rbac", "label": "👥 Contrôle d'accès par rôle", "desc": "RBAC, politiques granulaires", "priority": "medium"},
-        {"value": "gdpr", "label": "🇪🇺 Conformité RGPD complète", "desc": "DPO, registres, procédures", "priority": "high"},
-        {"value": "minimal", "label": "⚡ Configuration minimale", "desc": "Pour test rapide", "priority": "low"}
-    ]
-    
+    render_security_options()
+
+@st.fragment
+def render_security_options():
+    """Cases à cocher et navigation : un clic ne réexécute que ce fragment"""
     col1, col2 = st.columns(2)
     
-    for i, sec in enumerate(security_options):
+    for i, sec in enumerate(SECURITY_CHOICES):
         with col1 if i % 2 == 0 else col2:
             is_selected = sec['value'] in st.session_state.security_level
             
-            priority_color = {"high": "🔴", "medium": "🟡", "low": "🟢"}[sec['priority']]
-            priority_text = {"high": "Essentiel", "medium": "Recommandé", "low": "Optionnel"}[sec['priority']]
+            priority_color = LEVEL_BADGES[sec['priority']]
+            priority_text = PRIORITY_LABELS[sec['priority']]
             
-            if st.checkbox(f"{sec['label']} {priority_color}", value=is_selected, key=f"sec_{sec['value']}"):
-                if sec['value'] not in st.session_state.security_level:
-                    st.session_state.security_level.append(sec['value'])
-            else:
-                if sec['value'] in st.session_state.security_level:
-                    st.session_state.security_level.remove(sec['value'])
+            st.checkbox(
+                f"{sec['label']} {priority_color}",
+                value=is_selected,
+                key=f"sec_{sec['value']}",
+                on_change=update_selection,
+                args=('security_level', f"sec_{sec['value']}", sec['value'])
+            )
             
             st.caption(f"{sec['desc']} - {priority_text}")
     
@@ -522,8 +297,134 @@ def render_security():
             st.session_state.current_step = 5
             st.rerun()
 
+def render_sizing():
+    render_progress_bar(4, 5)
+    
+    st.markdown("""
+    <div class="step-card">
+        <div class="step-icon">📐</div>
+        <h2 style="text-align: center;">Quelle charge prévoyez-vous ?</h2>
+        <p style="text-align: center; color: #6b7280;">Ces volumes servent à dimensionner la base vectorielle</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    render_sizing_options()
+
+@st.fragment
+def render_sizing_options():
+    """Champs de dimensionnement et estimation : une saisie ne réexécute que ce fragment"""
+    sizing = st.session_state.sizing
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.number_input(
+            "Nombre de passages à indexer", min_value=1, max_value=MAX_CORPUS_SIZE, step=10_000,
+            value=sizing['corpus_size'], key="sizing_corpus_size",
+            on_change=update_sizing, args=('corpus_size', "sizing_corpus_size")
+        )
+        st.radio(
+            "Vectorisation", VECTORIZERS, format_func=VECTORIZER_LABELS.get, horizontal=True,
+            index=VECTORIZERS.index(sizing['vectorizer']), key="sizing_vectorizer",
+            on_change=update_sizing, args=('vectorizer', "sizing_vectorizer")
+        )
+        if sizing['vectorizer'] == 'transformers':
+            # La dimension est celle du modèle local
+            st.selectbox(
+                "Dimension des embeddings", (TRANSFORMERS_DIM,), disabled=True, key="sizing_embedding_dim_local"
+            )
+        else:
+            st.selectbox(
+                "Dimension des embeddings", EMBEDDING_DIMS,
+                index=EMBEDDING_DIMS.index(sizing['embedding_dim']), key="sizing_embedding_dim",
+                on_change=update_sizing, args=('embedding_dim', "sizing_embedding_dim")
+            )
+        st.selectbox(
+            "Mémoire par nœud (Go)", NODE_MEMORY_GB,
+            index=NODE_MEMORY_GB.index(sizing['node_memory_gb']), key="sizing_node_memory_gb",
+            on_change=update_sizing, args=('node_memory_gb', "sizing_node_memory_gb")
+        )
+    with col2:
+        st.number_input(
+            "Requêtes par seconde en pointe", min_value=1, step=5,
+            value=sizing['target_qps'], key="sizing_target_qps",
+            on_change=update_sizing, args=('target_qps', "sizing_target_qps")
+        )
+        st.select_slider(
+            "Objectif de latence (ms)", LATENCY_TARGETS_MS,
+            value=sizing['latency_ms'], key="sizing_latency_ms",
+            on_change=update_sizing, args=('latency_ms', "sizing_latency_ms")
+        )
+        st.radio(
+            "Topologie", TOPOLOGIES, format_func=TOPOLOGY_LABELS.get, horizontal=True,
+            index=TOPOLOGIES.index(sizing['topology']), key="sizing_topology",
+            on_change=update_sizing, args=('topology', "sizing_topology")
+        )
+        if sizing['topology'] == 'cluster':
+            st.selectbox(
+                "Facteur de réplication", REPLICATION_FACTORS,
+                index=REPLICATION_FACTORS.index(sizing['replication_factor']), key="sizing_replication_factor",
+                on_change=update_sizing, args=('replication_factor', "sizing_replication_factor")
+            )
+    
+    st.markdown("**Azure OpenAI**")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.number_input(
+            "Jetons de prompt par requête (moyenne)", min_value=1, step=100,
+            value=sizing['prompt_tokens'], key="sizing_prompt_tokens",
+            on_change=update_sizing, args=('prompt_tokens', "sizing_prompt_tokens")
+        )
+        st.number_input(
+            "Jetons de réponse par requête (moyenne)", min_value=1, step=50,
+            value=sizing['completion_tokens'], key="sizing_completion_tokens",
+            on_change=update_sizing, args=('completion_tokens', "sizing_completion_tokens")
+        )
+    with col2:
+        st.selectbox(
+            "Région (base vectorielle et compte principal)", AZURE_REGIONS, format_func=REGION_LABELS.get,
+            index=AZURE_REGIONS.index(sizing['region']), key="sizing_region",
+            on_change=update_sizing, args=('region', "sizing_region")
+        )
+        st.selectbox(
+            "Régions pour répartir la charge", REGION_COUNTS,
+            index=REGION_COUNTS.index(sizing['region_count']), key="sizing_region_count",
+            on_change=update_sizing, args=('region_count', "sizing_region_count")
+        )
+    
+    if sizing['vectorizer'] == 'openai' and PII_DATA.intersection(st.session_state.data_types):
+        st.caption("🔌 Données personnelles ou financières : le modèle local évite d'envoyer les passages à une API externe")
+    
+    # Estimation en direct
+    config = get_session_config()
+    estimation = config.sizing
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Mémoire estimée", f"{estimation.memory_gb} Go")
+    col2.metric("Par nœud", f"{estimation.cpus} vCPU / {estimation.memory_limit_gb} Go")
+    col3.metric("Nœuds", estimation.nodes)
+    if estimation.quantization != 'none':
+        st.info(f"Mémoire contrainte : quantification {estimation.quantization.upper()} activée")
+    if estimation.topology == 'single' and estimation.nodes_required > 1:
+        st.warning(f"L'index ne tient pas sur un nœud : topologie cluster conseillée ({estimation.nodes_required} shards)")
+    if not estimation.latency_ok:
+        st.warning(f"Coût estimé d'une requête ({estimation.query_ms} ms) supérieur à l'objectif de latence")
+    plan = config.openai_plan
+    st.caption(f"Azure OpenAI : {plan.chat_capacity}k TPM de complétion, max_tokens {plan.max_tokens}")
+    if plan.over_quota:
+        st.warning("Capacité par région supérieure au quota Standard habituel : ajoutez des régions ou prévoyez du PTU")
+    
+    # Navigation
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        if st.button("← Précédent", key="back_sizing"):
+            st.session_state.current_step = 4
+            st.rerun()
+    with col3:
+        if st.button("Suivant →", key="next_sizing"):
+            st.session_state.current_step = 6
+            st.rerun()
+
 def render_summary():
-    render_progress_bar(4, 4)
+    render_progress_bar(5, 5)
     
     st.markdown("""
     <div class="step-card">
@@ -535,6 +436,9 @@ def render_summary():
     
     summary = get_config_summary()
     
+    # Génération spéculative pendant la lecture du récapitulatif
+    job = start_kit_job()
+    
     st.markdown(f"""
     <div class="config-summary">
         {summary}
@@ -544,14 +448,16 @@ def render_summary():
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         if st.button("🚀 Générer mon kit sécurisé personnalisé", use_container_width=True):
-            st.session_state.current_step = 6
+            # Kit déjà prêt : on passe directement au téléchargement
+            st.session_state.current_step = 8 if job.done() and job.exception() is None else 7
             st.rerun()
     
     # Navigation
     col1, col2, col3 = st.columns([1, 1, 1])
     with col1:
         if st.button("← Précédent", key="back_summary"):
-            st.session_state.current_step = 4
+            get_job_manager().release(st.session_state.pop('kit_job'))
+            st.session_state.current_step = 5
             st.rerun()
 
 def render_generating():
@@ -563,27 +469,40 @@ def render_generating():
     </div>
     """, unsafe_allow_html=True)
     
-    # Barre de progression animée
+    # Progression alimentée par les étapes réelles du pipeline de génération
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    steps = [
-        "Analyse de vos besoins...",
-        "Configuration cloud optimale...",
-        "Paramètres de sécurité...",
-        "Génération des fichiers...",
-        "Validation finale..."
-    ]
+    job = start_kit_job()
+    
+    while not job.wait(timeout=0.05):
+        stage, fraction = job.progress()
+        status_text.text(stage)
+        progress_bar.progress(fraction)
     
-    for i, step in enumerate(steps):
-        status_text.text(step)
-        progress_bar.progress((i + 1) / len(steps))
-        time.sleep(1)
+    if job.exception() is not None:
+        st.error(f"La génération du kit a échoué : {job.exception()}")
+        if st.button("← Retour au récapitulatif", key="back_generating"):
+            st.session_state.current_step = 6
+            st.rerun()
+        return
     
-    st.session_state.current_step = 7
+    st.session_state.current_step = 8
     st.rerun()
 
 def render_complete():
+    # Le kit a déjà été produit par le job de génération de la session
+    job = start_kit_job()
+    try:
+        kit_content = job.result()
+    except Exception as e:
+        # Échec de la génération, ou de la récupération de l'archive auprès du service
+        st.error(f"Le kit n'a pas pu être récupéré : {e}")
+        if st.button("← Retour au récapitulatif", key="back_complete"):
+            st.session_state.current_step = 6
+            st.rerun()
+        return
+    
     st.markdown("""
     <div style="text-align: center; padding: 3rem;">
         <div class="step-icon">🎉</div>
@@ -591,48 +510,80 @@ def render_complete():
     </div>
     """, unsafe_allow_html=True)
     
-    st.markdown("""
+    cache_item = "<li>⚡ Cache des réponses</li>" if get_session_config().response_cache else ""
+    st.markdown(f"""
     <div style="background: #d1fae5; border: 1px solid #10b981; color: #065f46; padding: 1rem; border-radius: 0.5rem; margin: 1rem 0;">
         <h4>🎁 Votre kit personnalisé contient :</h4>
         <ul>
             <li>☁️ Configuration Terraform</li>
             <li>🗄️ Setup base vectorielle</li>
+            <li>📐 Schéma et index dimensionnés</li>
+            <li>📥 Script d'ingestion en masse</li>
+            {cache_item}
+            <li>🏋️ Test de charge</li>
             <li>📖 Guide de déploiement</li>
         </ul>
     </div>
     """, unsafe_allow_html=True)
     
-    # Génération du kit
-    config = {
-        'objective': st.session_state.get('objective', ''),
-        'data_types': st.session_state.get('data_types', []),
-        'security_level': st.session_state.get('security_level', [])
-    }
-    
-    zip_content = generate_secure_kit(config)
+    # Import différé : l'empaquetage ne sert qu'une fois le kit prêt
+    from securerag.packaging import FORMATS
+    archive_format = FORMATS[job.config.archive]
     
     col1, col2, col3 = st.columns([1, 2, 1])
     
     with col2:
         st.download_button(
             label="📥 Télécharger le kit",
-            data=zip_content,
-            file_name="secure-rag-kit.zip",
-            mime="application/zip",
+            data=kit_content,
+            file_name=archive_format.filename("secure-rag-kit"),
+            mime=archive_format.mime,
             use_container_width=True
         )
         
         if st.button("🔄 Créer un nouveau kit", use_container_width=True):
             # Reset de l'état
-            for key in ['objective', 'data_types', 'security_level', 'current_step']:
+            for key in ['objective', 'data_types', 'security_level', 'sizing', 'current_step', 'kit_job']:
                 if key in st.session_state:
                     del st.session_state[key]
             st.session_state.current_step = 1
             st.rerun()
 
+def render_debug_panel():
+    """Panneau de métriques, affiché avec ?debug=1 quand l'instrumentation est active"""
+    with st.expander("⏱️ Métriques de performance"):
+        snapshot = metrics.snapshot()
+        st.dataframe(
+            [
+                {
+                    'span': name,
+                    'appels': timing['count'],
+                    'moyenne (ms)': round(timing['sum_seconds'] / timing['count'] * 1000, 3),
+                    'max (ms)': round(timing['max_seconds'] * 1000, 3)
+                }
+                for name, timing in sorted(snapshot['timings'].items())
+            ],
+            use_container_width=True
+        )
+        st.json({'compteurs': snapshot['counters'], 'jauges': snapshot['gauges']})
+        st.caption("Empreinte des ressources partagées")
+        st.json(resources.footprint())
+
+STEP_RENDERERS = {
+    1: render_welcome,
+    2: render_objective,
+    3: render_data_types,
+    4: render_security,
+    5: render_sizing,
+    6: render_summary,
+    7: render_generating,
+    8: render_complete
+}
+
 def main():
     # Initialisation de l'état
     init_session_state()
+    start_metrics_server()
     
     # En-tête principal
     st.markdown("""
@@ -642,21 +593,19 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
+    if metrics.enabled and st.query_params.get('debug') == '1':
+        render_debug_panel()
+    
     # Affichage selon l'étape
-    if st.session_state.current_step == 1:
-        render_welcome()
-    elif st.session_state.current_step == 2:
-        render_objective()
-    elif st.session_state.current_step == 3:
-        render_data_types()
-    elif st.session_state.current_step == 4:
-        render_security()
-    elif st.session_state.current_step == 5:
-        render_summary()
-    elif st.session_state.current_step == 6:
-        render_generating()
-    elif st.session_state.current_step == 7:
-        render_complete()
+    renderer = STEP_RENDERERS.get(st.session_state.current_step)
+    if renderer is not None:
+        with metrics.span(f'step.{renderer.__name__}'):
+            renderer()
 
 if __name__ == "__main__":
-    main()
+    try:
+        with metrics.span('script.rerun'):
+            main()
+    finally:
+        if os.environ.get('SECURE_RAG_METRICS_FILE'):
+            metrics.export_file(os.environ['SECURE_RAG_METRICS_FILE'])
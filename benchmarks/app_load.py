@@ -0,0 +1,432 @@
+"""Test de charge de app.py : N utilisateurs simultanés parcourent le wizard, sans navigateur.
+
+    python -m benchmarks.app_load                              # paliers de 10, 25 et 50 utilisateurs
+    python -m benchmarks.app_load --users 50,100,200 --think 3 --output load.json
+    python -m benchmarks.app_load --url http://ui-pod:8501 --users 100    # serveur déjà déployé
+
+Chaque utilisateur virtuel ouvre une session par le websocket du serveur, avec le
+protocole du navigateur (BackMsg / ForwardMsg), et parcourt welcome → objective →
+data_types → security → sizing → summary → complete. Entre deux actions, il
+marque un temps de réflexion tiré d'une loi log-normale de médiane --think. La
+latence d'une action va de l'envoi du clic à la fin du dernier rerun qu'il
+déclenche (st.rerun compris, attente de la génération comprise pour render_complete).
+
+Chaque palier démarre un serveur `streamlit run` neuf, chauffé par un parcours non
+mesuré. Les sessions restent ouvertes jusqu'à la fin du dernier parcours, comme
+des onglets laissés sur la page de téléchargement. Le rapport donne, par palier :
+- les latences par étape ;
+- le CPU du serveur, en cœurs, lu dans /proc ;
+- la mémoire par session : RSS du serveur sessions ouvertes, moins le RSS après chauffe
+  (et, sur plusieurs paliers, la pente de cet écart en fonction du nombre d'utilisateurs) ;
+- le CPU du harnais, pour vérifier que le client n'est pas le goulot.
+Le point de saturation est le premier palier dont le p95 dépasse --budget-ms ou
+dont plus de 1 % des actions échouent ; les paliers suivants ne sont pas joués.
+Avec --url, le serveur n'est pas lancé et ses mesures CPU et mémoire sont omises.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from .common import DATA_TYPES, OBJECTIVES, ROOT, SECURITY_OPTIONS, latency_stats
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+APP_PATH = os.path.join(ROOT, 'app.py')
+
+# ScriptFinishedStatus : run interrompu par st.rerun(), la suite arrive dans un autre run
+FINISHED_EARLY_FOR_RERUN = 2
+FINISHED_FRAGMENT_RUN_SUCCESSFULLY = 3
+# Part d'actions en échec tolérée avant de déclarer le palier saturé
+MAX_ERROR_RATE = 0.01
+# Période d'échantillonnage du CPU et de la mémoire du serveur (s)
+SAMPLE_INTERVAL = 0.5
+# Dispersion des temps de réflexion (écart-type du logarithme)
+THINK_SIGMA = 0.5
+
+
+class ActionError(RuntimeError):
+    """Action impossible : widget absent ou exception levée par le script"""
+
+
+class VirtualUser:
+    """Un utilisateur et sa session Streamlit ; chaque action est chronométrée par étape"""
+
+    def __init__(self, url, index, think, timeout, samples, errors, release):
+        self.url = url
+        self.index = index
+        self.think_seconds = think
+        self.timeout = timeout
+        self.samples = samples
+        self.errors = errors
+        self.release = release
+        self.finished = asyncio.Event()
+        self.rng = random.Random(index)
+        self.ws = None
+        # Widgets affichés : id -> (type, libellé, fragment) ; valeurs renvoyées à chaque rerun
+        self.widgets = {}
+        self.values = {}
+
+    async def think(self, scale=1.0):
+        if self.think_seconds > 0:
+            await asyncio.sleep(self.rng.lognormvariate(0, THINK_SIGMA) * self.think_seconds * scale)
+
+    def _find(self, key=None, label=None):
+        for widget_id, (kind, widget_label, fragment_id) in self.widgets.items():
+            if (key is not None and widget_id.endswith(f'-{key}')) or (label is not None and widget_label.startswith(label)):
+                return widget_id, kind, fragment_id
+        raise ActionError(f"widget introuvable : {key or label}")
+
+    async def _send(self, trigger=None, fragment_id=''):
+        message = BackMsg()
+        state = message.rerun_script
+        state.query_string = ''
+        state.page_script_hash = ''
+        state.fragment_id = fragment_id
+        # Comme le navigateur : valeurs des widgets affichés, plus le déclencheur de l'action
+        for widget_id, (field, value) in self.values.items():
+            if widget_id in self.widgets:
+                widget = state.widget_states.widgets.add()
+                widget.id = widget_id
+                setattr(widget, field, value)
+        if trigger is not None:
+            widget = state.widget_states.widgets.add()
+            widget.id = trigger
+            widget.trigger_value = True
+        await self.ws.send(message.SerializeToString())
+
+    async def _until_finished(self):
+        """Lit les messages jusqu'à la fin du dernier rerun ; met à jour les widgets affichés"""
+        widgets = {}
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(await self.ws.recv())
+            kind = message.WhichOneof('type')
+            if kind == 'delta' and message.delta.WhichOneof('type') == 'new_element':
+                element = message.delta.new_element
+                element_kind = element.WhichOneof('type')
+                if element_kind == 'exception':
+                    raise ActionError(element.exception.message)
+                widget = getattr(element, element_kind)
+                widget_id = getattr(widget, 'id', '')
+                if widget_id:
+                    widgets[widget_id] = (element_kind, getattr(widget, 'label', ''), message.delta.fragment_id)
+            elif kind == 'script_finished':
+                if message.script_finished == FINISHED_EARLY_FOR_RERUN:
+                    # Les widgets du run interrompu ne sont plus affichés
+                    widgets = {}
+                    continue
+                if message.script_finished == FINISHED_FRAGMENT_RUN_SUCCESSFULLY:
+                    self.widgets.update(widgets)
+                else:
+                    self.widgets = widgets
+                return
+
+    async def _action(self, step, trigger=None, fragment_id=''):
+        start = time.perf_counter()
+        await self._send(trigger, fragment_id)
+        await asyncio.wait_for(self._until_finished(), self.timeout)
+        self.samples.setdefault(step, []).append(time.perf_counter() - start)
+
+    async def click(self, step, key=None, label=None):
+        widget_id, _, fragment_id = self._find(key, label)
+        await self._action(step, widget_id, fragment_id)
+
+    async def check(self, step, key):
+        widget_id, _, fragment_id = self._find(key)
+        self.values[widget_id] = ('bool_value', True)
+        await self._action(step, fragment_id=fragment_id)
+
+    async def walk(self):
+        """Parcours complet, de render_welcome à render_complete"""
+        objective = OBJECTIVES[self.index % len(OBJECTIVES)]
+        data_types = [dt for i, dt in enumerate(DATA_TYPES) if (self.index >> i) & 1] or ['public']
+        security = [opt for i, opt in enumerate(SECURITY_OPTIONS) if (self.index >> (i + 2)) & 1] or ['sso']
+
+        await self._action('render_welcome')
+        await self.think()
+        await self.click('render_objective', label='🚀 Commencer')
+        await self.think()
+        await self.click('render_objective', key=objective)
+        await self.think(0.3)
+        await self.click('render_data_types', label='Suivant')
+        for value in data_types:
+            await self.think(0.3)
+            await self.check('render_data_types', f'data_{value}')
+        await self.think(0.3)
+        await self.click('render_security', key='next_data')
+        for value in security:
+            await self.think(0.3)
+            await self.check('render_security', f'sec_{value}')
+        await self.think(0.3)
+        await self.click('render_sizing', key='next_security')
+        await self.think()
+        await self.click('render_summary', key='next_sizing')
+        # Lecture du récapitulatif : la génération spéculative du kit tourne pendant ce temps
+        await self.think()
+        await self.click('render_complete', label='🚀 Générer')
+        if not any(kind == 'download_button' for kind, _, _ in self.widgets.values()):
+            raise ActionError("le wizard n'a pas atteint l'étape de téléchargement")
+
+    async def run(self, delay=0.0):
+        """Arrivée après `delay` secondes, parcours, puis session gardée ouverte jusqu'à `release`"""
+        await asyncio.sleep(delay)
+        try:
+            async with websockets.connect(
+                f"{self.url.replace('http', 'ws', 1).rstrip('/')}/_stcore/stream",
+                subprotocols=['streamlit'], max_size=None, open_timeout=self.timeout
+            ) as self.ws:
+                try:
+                    await self.walk()
+                except (ActionError, asyncio.TimeoutError) as e:
+                    self.errors.append(f"{type(e).__name__} : {e}")
+                self.finished.set()
+                await self.release.wait()
+        except (OSError, websockets.exceptions.WebSocketException) as e:
+            self.errors.append(f"connexion : {e}")
+        finally:
+            self.finished.set()
+
+
+def _cpu_seconds(pid):
+    """Temps CPU (utilisateur + système) consommé par le processus"""
+    with open(f'/proc/{pid}/stat') as f:
+        # Champs 14 et 15 ; le nom du processus (champ 2) peut contenir des espaces
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+def _rss_bytes(pid):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+async def _sample_server(pid, samples, stop):
+    """Charge CPU (cœurs) et RSS du serveur, toutes les SAMPLE_INTERVAL secondes"""
+    last_time, last_cpu = time.perf_counter(), _cpu_seconds(pid)
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), SAMPLE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        now, cpu = time.perf_counter(), _cpu_seconds(pid)
+        samples.append(((cpu - last_cpu) / (now - last_time), _rss_bytes(pid)))
+        last_time, last_cpu = now, cpu
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, timeout=60):
+    """Lance `streamlit run app.py` et attend qu'il réponde à /_stcore/health"""
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'streamlit', 'run', APP_PATH,
+            '--server.headless', 'true', '--server.port', str(port),
+            '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false',
+        ],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"le serveur Streamlit s'est arrêté (code {process.returncode})")
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1):
+                return process
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"le serveur Streamlit ne répond pas après {timeout}s")
+
+
+async def run_level(url, users, think, ramp, timeout, budget_ms, pid=None):
+    """Un palier : chauffe, puis `users` parcours simultanés arrivant sur `ramp` secondes"""
+    warmup = asyncio.Event()
+    warmup.set()
+    warmup_errors = []
+    await VirtualUser(url, 0, 0, timeout, {}, warmup_errors, warmup).run()
+    if warmup_errors:
+        raise RuntimeError(f"parcours de chauffe : {warmup_errors[0]}")
+    rss_idle = _rss_bytes(pid) if pid else None
+
+    samples, errors, server_samples = {}, [], []
+    release, stop = asyncio.Event(), asyncio.Event()
+    sampler = asyncio.create_task(_sample_server(pid, server_samples, stop)) if pid else None
+    start, client_cpu = time.perf_counter(), time.process_time()
+    walkers = [VirtualUser(url, i + 1, think, timeout, samples, errors, release) for i in range(users)]
+    tasks = [asyncio.create_task(user.run(ramp * i / users)) for i, user in enumerate(walkers)]
+    await asyncio.gather(*(user.finished.wait() for user in walkers))
+    # Toutes les sessions encore ouvertes : empreinte mémoire au plus haut
+    rss_loaded = _rss_bytes(pid) if pid else None
+    duration = time.perf_counter() - start
+    client_cpu = time.process_time() - client_cpu
+    release.set()
+    await asyncio.gather(*tasks)
+    if sampler:
+        stop.set()
+        await sampler
+
+    actions = sum(len(values) for values in samples.values())
+    error_rate = len(errors) / (actions + len(errors)) if actions + len(errors) else 1.0
+    overall = latency_stats([value for values in samples.values() for value in values])
+    report = {
+        'users': users,
+        'duration_s': round(duration, 1),
+        'actions': actions,
+        'errors': len(errors),
+        'error_rate': round(error_rate, 4),
+        'overall': overall,
+        'steps': {step: latency_stats(values) for step, values in samples.items()},
+        'client_cpu_cores': round(client_cpu / duration, 2),
+        'passed': overall['p95_ms'] <= budget_ms and error_rate <= MAX_ERROR_RATE,
+        'error_samples': sorted(set(errors))[:5],
+    }
+    if pid:
+        cores = [c for c, _ in server_samples] or [0.0]
+        report['server'] = {
+            'cpu_cores_mean': round(sum(cores) / len(cores), 2),
+            'cpu_cores_peak': round(max(cores), 2),
+            'rss_idle_bytes': rss_idle,
+            'rss_loaded_bytes': rss_loaded,
+            'rss_peak_bytes': max([rss for _, rss in server_samples] + [rss_loaded]),
+            'memory_per_session_bytes': max(0, rss_loaded - rss_idle) // users,
+        }
+    return report
+
+
+def run(levels=(10, 25, 50), think=2.0, ramp=10.0, timeout=60.0, budget_ms=1000.0, url=None):
+    """Paliers croissants jusqu'au premier palier saturé"""
+    results = []
+    for users in levels:
+        process = None
+        level_url = url
+        if level_url is None:
+            port = _free_port()
+            process = start_server(port)
+            level_url = f'http://127.0.0.1:{port}'
+        try:
+            report = asyncio.run(run_level(
+                level_url, users, think, ramp, timeout, budget_ms, process.pid if process else None
+            ))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+        results.append(report)
+        _print_level(report)
+        if not report['passed']:
+            break
+    passed = [r['users'] for r in results if r['passed']]
+    saturated = [r['users'] for r in results if not r['passed']]
+    summary = {
+        'think_s': think,
+        'ramp_s': ramp,
+        'budget_ms': budget_ms,
+        'cpu_count': os.cpu_count(),
+        'levels': results,
+        'capacity_users': max(passed) if passed else 0,
+        'saturation_users': saturated[0] if saturated else None,
+    }
+    if url is None and len(results) >= 2:
+        summary['memory_per_session_bytes'] = _memory_slope(results)
+    return summary
+
+
+def _memory_slope(results):
+    """Mémoire par session : pente du RSS sessions ouvertes en fonction du nombre d'utilisateurs
+
+    Plus robuste que l'écart d'un seul palier, où l'allocateur réutilise la mémoire libérée.
+    """
+    points = [(r['users'], r['server']['rss_loaded_bytes'] - r['server']['rss_idle_bytes']) for r in results]
+    mean_users = sum(u for u, _ in points) / len(points)
+    mean_rss = sum(m for _, m in points) / len(points)
+    variance = sum((u - mean_users) ** 2 for u, _ in points)
+    if not variance:
+        # Un seul palier distinct : pas de pente mesurable
+        return None
+    covariance = sum((u - mean_users) * (m - mean_rss) for u, m in points)
+    return max(0, round(covariance / variance))
+
+
+def _print_level(report):
+    line = (
+        f"{report['users']:>4} utilisateurs : p50 {report['overall']['p50_ms']:.0f} ms, "
+        f"p95 {report['overall']['p95_ms']:.0f} ms, {report['errors']} erreur(s)"
+    )
+    server = report.get('server')
+    if server:
+        line += (
+            f", CPU serveur {server['cpu_cores_mean']} cœur(s) (pic {server['cpu_cores_peak']}), "
+            f"{server['memory_per_session_bytes'] / 1024 / 1024:.1f} Mo/session"
+        )
+    print(f"{'✅' if report['passed'] else '❌'} {line}", file=sys.stderr)
+    for error in report['error_samples']:
+        print(f"     erreur : {error}", file=sys.stderr)
+
+
+def _levels(text):
+    """Paliers d'utilisateurs, croissants et sans doublon ; ValueError si un palier est invalide"""
+    levels = set()
+    for value in text.split(','):
+        try:
+            users = int(value)
+        except ValueError:
+            users = 0
+        if users <= 0:
+            raise ValueError(f"palier invalide : {value!r}")
+        levels.add(users)
+    return sorted(levels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge de app.py (utilisateurs simultanés)")
+    parser.add_argument('--users', default='10,25,50', help="Paliers d'utilisateurs simultanés (défaut : 10,25,50)")
+    parser.add_argument('--think', type=float, default=2.0, help="Temps de réflexion médian entre deux actions, en s (défaut : 2)")
+    parser.add_argument('--ramp', type=float, default=10.0, help="Durée d'arrivée des utilisateurs d'un palier, en s (défaut : 10)")
+    parser.add_argument('--timeout', type=float, default=60.0, help="Délai maximal d'une action, en s (défaut : 60)")
+    parser.add_argument('--budget-ms', type=float, default=1000.0, help="p95 maximal d'une action, en ms (défaut : 1000)")
+    parser.add_argument('--url', default=None, help="Serveur déjà démarré (défaut : un serveur local neuf par palier)")
+    parser.add_argument('--min-users', type=int, default=None, help="Code de sortie 1 si la capacité est inférieure")
+    parser.add_argument('--output', help="Fichier JSON de résultats (défaut : stdout)")
+    args = parser.parse_args(argv)
+    try:
+        levels = _levels(args.users)
+    except ValueError as e:
+        parser.error(f"--users : {e}")
+
+    results = run(
+        levels=levels,
+        think=args.think, ramp=args.ramp, timeout=args.timeout, budget_ms=args.budget_ms, url=args.url
+    )
+    payload = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(payload + '\n')
+    else:
+        print(payload)
+    if results['saturation_users'] is not None:
+        print(f"Saturation à {results['saturation_users']} utilisateurs simultanés", file=sys.stderr)
+    if args.min_users is not None and results['capacity_users'] < args.min_users:
+        print(f"RÉGRESSION capacité : {results['capacity_users']} < {args.min_users} utilisateurs", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Latence de rerun par étape du wizard, mesurée via le harnais AppTest de Streamlit."""
+import os
+import resource
+import time
+
+from .common import DATA_TYPES, OBJECTIVES, ROOT, SECURITY_OPTIONS, latency_stats
+
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(ROOT, 'app.py')
+
+
+class _Walk:
+    """Un utilisateur qui parcourt le wizard ; chaque rerun est chronométré par étape"""
+
+    def __init__(self, samples):
+        self.samples = samples
+        self.at = AppTest.from_file(APP_PATH, default_timeout=60)
+
+    def run(self, step):
+        start = time.perf_counter()
+        self.at.run()
+        self.samples.setdefault(step, []).append(time.perf_counter() - start)
+        if self.at.exception:
+            raise RuntimeError(f"{step} : {self.at.exception[0].message}")
+
+    def click(self, label, step):
+        for button in self.at.button:
+            if button.label.startswith(label):
+                button.click()
+                return self.run(step)
+        raise RuntimeError(f"bouton introuvable : {label}")
+
+    def check(self, key, step):
+        self.at.checkbox(key=key).check()
+        self.run(step)
+
+
+def walk(samples, index):
+    """Parcours complet, de render_welcome à render_complete, pour la configuration n° `index`"""
+    objective = OBJECTIVES[index % len(OBJECTIVES)]
+    data_types = [dt for i, dt in enumerate(DATA_TYPES) if (index >> i) & 1] or ['public']
+    security = [opt for i, opt in enumerate(SECURITY_OPTIONS) if (index >> (i + 2)) & 1] or ['sso']
+
+    user = _Walk(samples)
+    user.run('render_welcome')
+    user.click('🚀 Commencer', 'render_objective')
+    user.at.button(key=objective).click()
+    user.run('render_objective')
+    user.click('Suivant', 'render_data_types')
+    for value in data_types:
+        user.check(f'data_{value}', 'render_data_types')
+    user.click('Suivant', 'render_security')
+    for value in security:
+        user.check(f'sec_{value}', 'render_security')
+    user.click('Suivant', 'render_sizing')
+    user.click('Suivant', 'render_summary')
+    # Inclut render_generating si le kit spéculatif n'est pas encore prêt
+    user.click('🚀 Générer', 'render_complete')
+    if user.at.session_state.current_step != 8:
+        raise RuntimeError("le wizard n'a pas atteint l'étape de téléchargement")
+
+
+def run(walks=20):
+    """Latence de rerun par étape sur `walks` parcours du wizard"""
+    samples = {}
+    for index in range(walks):
+        walk(samples, index)
+    return {
+        'walks': walks,
+        'steps': {step: latency_stats(values) for step, values in samples.items()},
+        # ru_maxrss est exprimé en kilo-octets sous Linux
+        'peak_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }
@@ -0,0 +1,58 @@
+"""Outils communs aux benchmarks : combinaisons de configurations et statistiques."""
+import itertools
+import os
+import sys
+
+# Les benchmarks se lancent depuis la racine du dépôt (python -m benchmarks.run)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from securerag.config import DATA_TYPES, OBJECTIVES, SECURITY_OPTIONS, KitConfig  # noqa: E402
+
+
+def non_empty_subsets(values):
+    """Tous les sous-ensembles non vides, dans l'ordre des options du wizard"""
+    for size in range(1, len(values) + 1):
+        for subset in itertools.combinations(values, size):
+            yield list(subset)
+
+
+def all_configs():
+    """Toutes les configurations atteignables depuis le wizard"""
+    for objective in OBJECTIVES:
+        for data_types in non_empty_subsets(DATA_TYPES):
+            for security_level in non_empty_subsets(SECURITY_OPTIONS):
+                yield KitConfig(objective, data_types, security_level)
+
+
+def sample_configs(limit=None):
+    """Configurations à mesurer : toutes, ou un échantillon régulier de `limit` configurations"""
+    configs = list(all_configs())
+    if limit and limit < len(configs):
+        step = len(configs) / limit
+        configs = [configs[int(i * step)] for i in range(limit)]
+    return configs
+
+
+def percentile(sorted_values, fraction):
+    """Percentile par interpolation linéaire sur une liste triée"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def latency_stats(samples):
+    """Percentiles de latence en millisecondes à partir de durées en secondes"""
+    values = sorted(sample * 1000 for sample in samples)
+    return {
+        'count': len(values),
+        'p50_ms': percentile(values, 0.50),
+        'p95_ms': percentile(values, 0.95),
+        'p99_ms': percentile(values, 0.99),
+        'max_ms': values[-1] if values else 0.0,
+    }
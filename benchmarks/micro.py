@@ -0,0 +1,59 @@
+"""Micro-benchmarks des fonctions de génération, sur toutes les combinaisons du wizard."""
+import time
+import tracemalloc
+
+from .common import latency_stats, sample_configs
+
+from securerag.generator import KIT_ARTIFACTS, generate_config_summary, generate_secure_kit
+
+# Chaque générateur du registre, puis le kit complet et le résumé
+FUNCTIONS = [
+    (generator.target.split(':')[1], generator.load()) for generator in KIT_ARTIFACTS
+] + [
+    ('generate_secure_kit', generate_secure_kit),
+    ('get_config_summary', generate_config_summary),
+]
+
+# Nombre de configurations rejouées sous tracemalloc (qui ralentit fortement l'exécution)
+MEMORY_SAMPLE = 200
+
+
+def _peak_memory(function, configs):
+    tracemalloc.start()
+    try:
+        for config in configs:
+            function(config)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(limit=None):
+    """Mesure latence et pic mémoire de chaque fonction ; taille des archives produites"""
+    configs = sample_configs(limit)
+    results = {}
+    zip_sizes = []
+    for name, function in FUNCTIONS:
+        # Premier appel hors mesure : compilation des templates
+        function(configs[0])
+        samples = []
+        for config in configs:
+            start = time.perf_counter()
+            output = function(config)
+            samples.append(time.perf_counter() - start)
+            if function is generate_secure_kit:
+                zip_sizes.append(len(output))
+        stats = latency_stats(samples)
+        stats['peak_memory_bytes'] = _peak_memory(function, configs[:MEMORY_SAMPLE])
+        results[name] = stats
+
+    zip_sizes.sort()
+    return {
+        'configs': len(configs),
+        'functions': results,
+        'zip_size_bytes': {
+            'min': zip_sizes[0],
+            'p50': zip_sizes[len(zip_sizes) // 2],
+            'max': zip_sizes[-1],
+        },
+    }
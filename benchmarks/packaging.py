@@ -0,0 +1,53 @@
+"""Compromis temps de compression / taille de sortie pour chaque format d'archive."""
+import random
+import statistics
+import time
+
+from .common import KitConfig
+
+from securerag.generator import KIT_ARTIFACTS
+from securerag.packaging import FORMATS, POLICIES, write_archive
+
+# Vocabulaire du corpus synthétique (documents métier en texte brut)
+WORDS = (
+    "contrat client données politique sécurité accès rapport budget analyse projet "
+    "équipe service procédure conformité document annexe article clause période "
+    "montant validation responsable traitement stockage chiffrement audit journal"
+).split()
+
+
+def _kit_entries():
+    config = KitConfig('assistant', ('hr', 'personal', 'financial'), ('sso', 'audit', 'encryption'))
+    return [(generator.output, generator.load()(config)) for generator in KIT_ARTIFACTS.select(config)]
+
+
+def _corpus_entries(documents=200, words_per_document=2000, seed=42):
+    """Corpus d'exemple déterministe (~3 Mo) joint au kit"""
+    rng = random.Random(seed)
+    return [
+        (f"corpus/doc-{i:04d}.txt", ' '.join(rng.choice(WORDS) for _ in range(words_per_document)))
+        for i in range(documents)
+    ]
+
+
+def run(repeats=5):
+    """Temps médian de compression et taille produite, par kit représentatif et par format"""
+    kit = _kit_entries()
+    samples = {'kit': kit, 'kit+corpus': kit + _corpus_entries()}
+    results = {}
+    for sample_name, entries in samples.items():
+        raw_bytes = sum(len(content.encode('utf-8')) for _, content in entries)
+        formats = {}
+        for name in FORMATS:
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                data = write_archive(entries, name)
+                timings.append(time.perf_counter() - start)
+            formats[name] = {
+                'compress_ms': statistics.median(timings) * 1000,
+                'size_bytes': len(data),
+                'ratio': len(data) / raw_bytes,
+            }
+        results[sample_name] = {'raw_bytes': raw_bytes, 'formats': formats}
+    return {'policies': dict(POLICIES), 'samples': results}
@@ -0,0 +1,184 @@
+"""Suite de benchmarks et détection de régressions par rapport à une référence.
+
+    python -m benchmarks.run                      # micro + wizard, comparés à baseline.json
+    python -m benchmarks.run --suite micro --sample 500
+    python -m benchmarks.run --suite packaging    # temps de compression / taille par format
+    python -m benchmarks.run --suite startup      # démarrage à froid de app.py
+    python -m benchmarks.run --save-baseline      # met à jour la référence
+
+Le test de charge de l'application (utilisateurs simultanés) se lance à part :
+python -m benchmarks.app_load.
+
+Les résultats sont écrits en JSON (stdout ou --output). Le code de sortie vaut 1
+si une métrique des suites micro, app ou startup dépasse la référence de plus de
+--tolerance, ou si un module de génération est chargé dès le premier rendu ; la
+suite packaging est informative. Une suite en régression est remesurée jusqu'à
+--repeats fois et comparée sur la médiane des mesures (la référence enregistrée
+est elle aussi une médiane) ; une suite mesurée sur un autre échantillon que la
+référence (--sample, --walks, --starts) n'est pas comparée.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+
+from .common import ROOT
+
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+# Métriques comparées (plus petit = meilleur). Côté wizard, le p95 sur une vingtaine
+# de parcours est dominé par le ramasse-miettes : seule la médiane est comparée.
+COMPARED_METRICS = {
+    'micro': ('p50_ms', 'p95_ms', 'peak_memory_bytes'),
+    'app': ('p50_ms',),
+    'startup': ('p50_ms',),
+}
+
+# Écart absolu en dessous duquel une latence est considérée comme du bruit de mesure
+NOISE_FLOOR_MS = {'micro': 0.05, 'app': 5.0, 'startup': 50.0}
+
+# Taille de l'échantillon de chaque suite : deux mesures ne se comparent qu'à taille égale
+SAMPLE_PARAMETERS = {'micro': 'configs', 'app': 'walks', 'startup': 'starts'}
+
+
+def _flatten(results):
+    """Aplatit les résultats en {chemin: valeur} pour les métriques comparées"""
+    flat = {}
+    for name, stats in results.get('micro', {}).get('functions', {}).items():
+        for metric in COMPARED_METRICS['micro']:
+            if metric in stats:
+                flat[f'micro.{name}.{metric}'] = stats[metric]
+    for name, value in results.get('micro', {}).get('zip_size_bytes', {}).items():
+        flat[f'micro.zip_size_bytes.{name}'] = value
+    for step, stats in results.get('app', {}).get('steps', {}).items():
+        for metric in COMPARED_METRICS['app']:
+            if metric in stats:
+                flat[f'app.{step}.{metric}'] = stats[metric]
+    for metric in COMPARED_METRICS['startup']:
+        stats = results.get('startup', {}).get('first_render', {})
+        if metric in stats:
+            flat[f'startup.first_render.{metric}'] = stats[metric]
+    return flat
+
+
+def mismatched_suites(results, baseline):
+    """Suites mesurées sur un autre échantillon que la référence : (suite, paramètre, référence, mesure)"""
+    mismatched = []
+    for suite, parameter in SAMPLE_PARAMETERS.items():
+        if suite not in results or suite not in baseline:
+            continue
+        value, reference = results[suite].get(parameter), baseline[suite].get(parameter)
+        if value != reference:
+            mismatched.append((suite, parameter, reference, value))
+    return mismatched
+
+
+def median_results(runs):
+    """Médiane, valeur par valeur, de plusieurs mesures d'une même suite"""
+    first = runs[0]
+    if isinstance(first, dict):
+        return {key: median_results([run[key] for run in runs if key in run]) for key in first}
+    if isinstance(first, (int, float)) and not isinstance(first, bool):
+        return statistics.median(runs)
+    return first
+
+
+def compare(results, baseline, tolerance):
+    """Liste des régressions : (métrique, référence, mesure)"""
+    current = _flatten(results)
+    skipped = {suite for suite, *_ in mismatched_suites(results, baseline)}
+    regressions = []
+    for path, reference in _flatten(baseline).items():
+        value = current.get(path)
+        if value is None or reference <= 0 or path.split('.', 1)[0] in skipped:
+            continue
+        if path.endswith('_ms') and value - reference < NOISE_FLOOR_MS[path.split('.', 1)[0]]:
+            continue
+        if value > reference * (1 + tolerance):
+            regressions.append((path, reference, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du Secure RAG Kit Generator")
+    parser.add_argument('--suite', choices=['micro', 'app', 'packaging', 'startup', 'all'], default='all')
+    parser.add_argument('--sample', type=int, default=None, help="Nombre de configurations (défaut : toutes)")
+    parser.add_argument('--walks', type=int, default=20, help="Parcours du wizard mesurés (défaut : 20)")
+    parser.add_argument('--starts', type=int, default=5, help="Démarrages à froid mesurés (défaut : 5)")
+    parser.add_argument('--output', help="Fichier JSON de résultats (défaut : stdout)")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Référence à comparer")
+    parser.add_argument('--save-baseline', action='store_true', help="Enregistre les résultats comme référence")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Dégradation tolérée (défaut : 0.25 = +25 %%)")
+    parser.add_argument(
+        '--repeats', type=int, default=3,
+        help="Mesures d'une suite en régression, comparées sur leur médiane (défaut : 3)"
+    )
+    args = parser.parse_args(argv)
+
+    def measure(suite):
+        if suite == 'micro':
+            from . import micro
+            return micro.run(limit=args.sample)
+        if suite == 'app':
+            from . import app_rerun
+            return app_rerun.run(walks=args.walks)
+        if suite == 'packaging':
+            from . import packaging
+            return packaging.run()
+        from . import startup
+        return startup.run(starts=args.starts)
+
+    suites = ('micro', 'app', 'packaging', 'startup') if args.suite == 'all' else (args.suite,)
+    runs = {suite: [measure(suite)] for suite in suites}
+    results = {'python': platform.python_version(), 'machine': platform.machine()}
+    results.update({suite: samples[0] for suite, samples in runs.items()})
+
+    baseline = None
+    if args.save_baseline:
+        # Référence : médiane de --repeats mesures de chaque suite comparée
+        remeasured = set(suites) & set(SAMPLE_PARAMETERS)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        for suite, parameter, reference, value in mismatched_suites(results, baseline):
+            print(f"Comparaison {suite} ignorée : {parameter} = {value} (référence {reference})", file=sys.stderr)
+        # Une régression isolée est souvent du bruit : la suite est remesurée, la médiane fait foi
+        remeasured = {path.split('.', 1)[0] for path, *_ in compare(results, baseline, args.tolerance)}
+    else:
+        remeasured = set()
+    for suite in remeasured:
+        while len(runs[suite]) < args.repeats:
+            runs[suite].append(measure(suite))
+        results[suite] = median_results(runs[suite])
+        results[suite]['repeats'] = len(runs[suite])
+
+    payload = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(payload + '\n')
+    else:
+        print(payload)
+
+    # Contrôle indépendant de la référence : la génération reste hors du premier rendu
+    deferred = results.get('startup', {}).get('deferred_loaded', [])
+    for name in deferred:
+        print(f"RÉGRESSION startup : {name} chargé dès le premier rendu", file=sys.stderr)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            f.write(payload + '\n')
+        return 1 if deferred else 0
+
+    if baseline is None:
+        print(f"Aucune référence trouvée ({args.baseline}) : comparaison ignorée", file=sys.stderr)
+        return 1 if deferred else 0
+    regressions = compare(results, baseline, args.tolerance)
+    for path, reference, value in regressions:
+        print(f"RÉGRESSION {path} : {value:.3f} (référence {reference:.3f})", file=sys.stderr)
+    return 1 if regressions or deferred else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
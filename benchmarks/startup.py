@@ -0,0 +1,92 @@
+"""Démarrage à froid de app.py : temps d'import par paquet et temps jusqu'au premier rendu.
+
+Chaque mesure tourne dans un processus neuf (`python -X importtime`), comme un
+nouveau réplica qui reçoit sa première session. Les modules de DEFERRED_MODULES
+ne servent qu'à la génération : les voir chargés par le premier rendu est une
+régression, quel que soit le temps mesuré.
+"""
+import json
+import os
+import subprocess
+import sys
+
+from .common import ROOT, latency_stats
+
+APP_PATH = os.path.join(ROOT, 'app.py')
+
+# Chargés à la demande (génération, mode client, scraping des métriques)
+DEFERRED_MODULES = (
+    'jinja2', 'requests', 'zipfile', 'lzma', 'tarfile', 'http.server',
+    'securerag.generator', 'securerag.registry', 'securerag.artifacts', 'securerag.engine',
+    'securerag.fragments', 'securerag.client',
+)
+
+# Premier rendu dans le processus mesuré ; le résultat est écrit sur stdout en JSON
+_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+# Déjà chargés par l'interpréteur ou Streamlit (zipfile via site...) : hors du périmètre de l'app
+preloaded = set(sys.modules)
+at = AppTest.from_file({APP_PATH!r}, default_timeout=60).run()
+rendered = time.perf_counter()
+print(json.dumps({{
+    'streamlit_import_ms': (imported - start) * 1000,
+    'first_render_ms': (rendered - start) * 1000,
+    'exception': [e.message for e in at.exception],
+    'deferred_loaded': [name for name in {DEFERRED_MODULES!r} if name in sys.modules and name not in preloaded],
+}}))
+"""
+
+# Paquets détaillés dans la répartition des imports
+TOP_PACKAGES = 15
+
+
+def _import_breakdown(stderr):
+    """Temps cumulé (ms) des imports de premier niveau, par paquet racine"""
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Les sous-imports sont indentés : seuls les imports de premier niveau sont sommés
+        if name.startswith('  '):
+            continue
+        root = name.strip().split('.')[0]
+        packages[root] = packages.get(root, 0.0) + int(cumulative) / 1000
+    return packages
+
+
+def probe():
+    """Un démarrage à froid mesuré dans un processus neuf"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROBE],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['imports_ms'] = _import_breakdown(result.stderr)
+    return report
+
+
+def run(starts=5):
+    """Médiane sur `starts` démarrages ; répartition des imports du dernier"""
+    samples = []
+    streamlit_samples = []
+    for _ in range(starts):
+        report = probe()
+        if report['exception']:
+            raise RuntimeError(f"premier rendu : {report['exception'][0]}")
+        samples.append(report['first_render_ms'] / 1000)
+        streamlit_samples.append(report['streamlit_import_ms'] / 1000)
+    return {
+        'starts': starts,
+        'first_render': latency_stats(samples),
+        'streamlit_import': latency_stats(streamlit_samples),
+        'securerag_import_ms': round(report['imports_ms'].get('securerag', 0.0), 1),
+        'imports_ms': {
+            name: round(ms, 1)
+            for name, ms in sorted(report['imports_ms'].items(), key=lambda item: item[1], reverse=True)[:TOP_PACKAGES]
+        },
+        'deferred_loaded': report['deferred_loaded'],
+    }
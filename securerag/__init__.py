@@ -0,0 +1 @@
+"""Briques partagées du Secure RAG Kit Generator (sans dépendance à Streamlit)."""
@@ -0,0 +1 @@
+"""Générateurs d'artefacts du kit, un module par cible, importés à la demande par le registre."""
@@ -0,0 +1,17 @@
+"""Infrastructure Azure : configuration Terraform (main.tf)."""
+from ..fragments import Fragment, render_fragments
+
+TERRAFORM_FRAGMENTS = (
+    Fragment('terraform/header.tf.j2'),
+    Fragment('terraform/variables.tf.j2', ('openai_plan',)),
+    Fragment('terraform/resource_group.tf.j2', ('objective', 'data_types')),
+    Fragment('terraform/key_vault.tf.j2', ('encryption_at_rest',)),
+    Fragment('terraform/openai.tf.j2', ('data_sensitivity', 'openai_plan')),
+    Fragment('terraform/common.tf.j2'),
+    Fragment('terraform/outputs.tf.j2', ('openai_plan',)),
+)
+
+
+def generate_terraform_config(config, **options):
+    """Génère la configuration Terraform"""
+    return render_fragments(TERRAFORM_FRAGMENTS, config, **options)
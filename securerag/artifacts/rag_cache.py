@@ -0,0 +1,11 @@
+"""Module de cache des réponses et des embeddings (objectifs de recherche et d'assistant)."""
+from ..fragments import Fragment, render_fragments
+
+RAG_CACHE_FRAGMENTS = (
+    Fragment('rag_cache.py.j2', ('response_cache',)),
+)
+
+
+def generate_rag_cache(config, **options):
+    """Génère le module de cache des réponses (vide pour les objectifs sans cache)"""
+    return render_fragments(RAG_CACHE_FRAGMENTS, config, **options)
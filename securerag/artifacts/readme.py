@@ -0,0 +1,49 @@
+"""README du kit : présentation, guide de déploiement et choix de dimensionnement."""
+from ..fragments import Fragment, render_fragments
+from ..generator import format_generated_at
+from ..labels import DATA_TYPE_LABELS, OBJECTIVE_LABELS, VECTORIZER_LABELS
+from ..loadtesting import LOADTEST_DEPENDS, loadtest_context
+from ..provisioning import REGION_QUOTA_UNITS
+from ..vectorizers import VECTORIZERS, plan_inference
+
+
+def _readme_overview_context(values):
+    return {
+        'objective_label': OBJECTIVE_LABELS.get(values['objective'], 'Non défini'),
+        'data_type_labels': [DATA_TYPE_LABELS.get(dt, dt) for dt in values['data_types']],
+        'security_level': values['security_level']
+    }
+
+
+def _readme_vectorizer_context(values):
+    # Débits de chaque option, pour comparaison avec l'option retenue
+    return {
+        'inference': values['inference'],
+        'options': [plan_inference(v, values['objective'], values['target_qps']) for v in VECTORIZERS],
+        'labels': VECTORIZER_LABELS,
+        'openai_plan': values['openai_plan'],
+        'embedding_dim': values['embedding_dim'],
+    }
+
+
+def _readme_openai_context(values):
+    return {'openai_plan': values['openai_plan'], 'quota': REGION_QUOTA_UNITS}
+
+
+README_FRAGMENTS = (
+    Fragment('readme/overview.md.j2', ('objective', 'data_types', 'security_level'), _readme_overview_context),
+    Fragment('readme/guide.md.j2', ('gdpr_relevant', 'response_cache')),
+    Fragment('readme/sizing.md.j2', ('sizing', 'inference')),
+    Fragment('readme/openai.md.j2', ('openai_plan',), _readme_openai_context),
+    Fragment('readme/vectorizer.md.j2', ('objective', 'target_qps', 'inference', 'openai_plan', 'embedding_dim'),
+             _readme_vectorizer_context),
+    Fragment('readme/cache.md.j2', ('anonymous_access', 'response_cache')),
+    Fragment('readme/loadtest.md.j2', LOADTEST_DEPENDS, loadtest_context),
+    Fragment('readme/footer.md.j2', ('generated_at',)),
+)
+
+
+def generate_readme(config, generated_at=None, **options):
+    """Génère le README"""
+    # Horodatage à la minute : le pied de page reste en cache pendant la minute courante
+    return render_fragments(README_FRAGMENTS, config, generated_at=format_generated_at(generated_at), **options)
@@ -0,0 +1,22 @@
+"""Scripts d'exploitation livrés dans le kit : ingestion et test de charge."""
+from ..fragments import Fragment, render_fragments
+from ..ingestion import ingest_context
+from ..loadtesting import LOADTEST_DEPENDS, loadtest_context
+
+INGEST_FRAGMENTS = (
+    Fragment('ingest.py.j2', ('objective', 'data_types', 'sizing', 'inference'), ingest_context),
+)
+
+LOADTEST_FRAGMENTS = (
+    Fragment('loadtest.py.j2', LOADTEST_DEPENDS, loadtest_context),
+)
+
+
+def generate_ingest_script(config, **options):
+    """Génère le script d'ingestion adapté à l'objectif et aux données"""
+    return render_fragments(INGEST_FRAGMENTS, config, **options)
+
+
+def generate_loadtest_script(config, **options):
+    """Génère le test de charge, calé sur le budget du dimensionnement"""
+    return render_fragments(LOADTEST_FRAGMENTS, config, **options)
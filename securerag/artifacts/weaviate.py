@@ -0,0 +1,20 @@
+"""Base vectorielle Weaviate : déploiement et schéma de la classe indexée."""
+from ..fragments import Fragment, render_fragments
+
+WEAVIATE_FRAGMENTS = (
+    Fragment('weaviate-config.yaml.j2', ('anonymous_access', 'sizing', 'inference', 'response_cache')),
+)
+
+WEAVIATE_SCHEMA_FRAGMENTS = (
+    Fragment('weaviate-schema.json.j2', ('sizing', 'inference', 'openai_plan', 'embedding_dim')),
+)
+
+
+def generate_weaviate_config(config, **options):
+    """Génère la configuration Weaviate"""
+    return render_fragments(WEAVIATE_FRAGMENTS, config, **options)
+
+
+def generate_weaviate_schema(config, **options):
+    """Génère le schéma Weaviate (index HNSW dimensionné, vectorisation Azure OpenAI le cas échéant)"""
+    return render_fragments(WEAVIATE_SCHEMA_FRAGMENTS, config, **options)
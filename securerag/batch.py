@@ -0,0 +1,180 @@
+"""Génération de kits en lot, sans interface Streamlit.
+
+Exemples :
+
+    python -m securerag.batch manifest.yaml -o kits/
+    python -m securerag.batch configs.jsonl -o kits/ --bundle --workers 8
+
+Le manifeste YAML contient soit une liste de configurations, soit une clé
+`configs`, soit une clé `matrix` dont le produit cartésien est généré :
+
+    matrix:
+      objective: [search, assistant]
+      data_types: [[public], [personal, hr]]
+      security_level: [[sso, audit]]
+      corpus_size: [100000, 5000000]
+"""
+import argparse
+import functools
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import KitConfig
+from .engine import precompile
+from .generator import generate_secure_kit
+from .packaging import FORMATS, ArchiveWriter, kit_digest, reproducible_mtime
+
+CONFIG_FIELDS = (
+    'objective', 'data_types', 'security_level',
+    'corpus_size', 'embedding_dim', 'target_qps', 'latency_ms', 'node_memory_gb',
+    'topology', 'replication_factor', 'vectorizer',
+    'prompt_tokens', 'completion_tokens', 'region', 'region_count',
+)
+
+
+def expand_matrix(matrix):
+    """Développe une matrice de configurations en liste de configurations"""
+    fields = [field for field in CONFIG_FIELDS if field in matrix]
+    configs = []
+    for values in itertools.product(*(matrix[field] for field in fields)):
+        configs.append(dict(zip(fields, values)))
+    return configs
+
+
+def load_manifest(path):
+    """Charge les configurations d'un manifeste YAML ou JSONL"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        import yaml
+        document = yaml.safe_load(f) or []
+
+    if isinstance(document, list):
+        return document
+    if not isinstance(document, dict):
+        raise ValueError("liste de configurations ou objet (configs, matrix) attendu")
+    configs = list(document.get('configs', []))
+    if 'matrix' in document:
+        configs.extend(expand_matrix(document['matrix']))
+    return configs
+
+
+def kit_name(config, name=None):
+    """Nom de fichier stable d'un kit dans le répertoire de sortie"""
+    return FORMATS[config.archive].filename(f"{name or config.objective}-{config.key[:12]}")
+
+
+def _build(config, reproducible=False):
+    return generate_secure_kit(config, reproducible=reproducible)
+
+
+def run_batch(configs, output_dir, bundle=False, workers=None, archive=None, reproducible=False):
+    """Génère les kits sur un pool de processus et écrit les archives
+
+    `archive` s'applique aux entrées du manifeste qui ne précisent pas leur format.
+    Les empreintes SHA-256 des kits sont écrites dans SHA256SUMS ; en mode
+    reproductible, elles sont stables d'une exécution à l'autre.
+    """
+    # Les configurations identiques (à l'ordre près) ne sont générées qu'une fois ;
+    # les champs annexes du manifeste (name, ...) ne servent qu'au nommage
+    unique = {}
+    names = {}
+    for index, entry in enumerate(configs, 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"entrée {index} : objet attendu, reçu {entry!r}")
+        if archive and 'archive' not in entry:
+            entry = {**entry, 'archive': archive}
+        try:
+            config = KitConfig.from_dict(entry)
+        except ValueError as e:
+            raise ValueError(f"entrée {index} : {e}") from None
+        unique.setdefault(config.key, config)
+        names.setdefault(config.key, entry.get('name'))
+    keys = list(unique)
+
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=precompile) as pool:
+        chunksize = max(1, len(keys) // ((workers or os.cpu_count() or 1) * 4))
+        build = functools.partial(_build, reproducible=reproducible)
+        results = pool.map(build, (unique[key] for key in keys), chunksize=chunksize)
+
+        written = []
+        digests = []
+        if bundle:
+            bundle_path = os.path.join(output_dir, 'secure-rag-kits.zip')
+            # Les kits sont déjà compressés : inutile de les recompresser dans le lot
+            mtime = reproducible_mtime() if reproducible else None
+            with open(bundle_path, 'wb') as f, ArchiveWriter(f, 'zip-stored', mtime) as writer:
+                for key, data in zip(keys, results):
+                    filename = kit_name(unique[key], names[key])
+                    writer.add(filename, data)
+                    digests.append((kit_digest(data), filename))
+            written.append(bundle_path)
+        else:
+            for key, data in zip(keys, results):
+                filename = kit_name(unique[key], names[key])
+                with open(os.path.join(output_dir, filename), 'wb') as f:
+                    f.write(data)
+                digests.append((kit_digest(data), filename))
+                written.append(os.path.join(output_dir, filename))
+    elapsed = time.perf_counter() - start
+
+    with open(os.path.join(output_dir, 'SHA256SUMS'), 'w', encoding='utf-8') as f:
+        f.writelines(f"{digest}  {filename}\n" for digest, filename in digests)
+
+    return {
+        'requested': len(configs),
+        'generated': len(keys),
+        'seconds': elapsed,
+        'kits_per_second': len(keys) / elapsed if elapsed else 0.0,
+        'outputs': written,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère des kits Secure RAG depuis un manifeste YAML ou JSONL")
+    parser.add_argument('manifest', help="Manifeste YAML (.yaml/.yml) ou JSONL (.jsonl)")
+    parser.add_argument('-o', '--output', default='kits', help="Répertoire de sortie (défaut : kits)")
+    parser.add_argument('--bundle', action='store_true', help="Regroupe tous les kits dans une seule archive")
+    parser.add_argument('--workers', type=int, default=None, help="Nombre de processus (défaut : nombre de CPU)")
+    parser.add_argument(
+        '--reproducible', action='store_true',
+        help="Kits reproductibles octet pour octet (horodatages fixes, README non daté)"
+    )
+    parser.add_argument(
+        '--archive', default=None,
+        help="Format d'archive ou politique (fastest, balanced, smallest) ; défaut : SECURE_RAG_ARCHIVE ou zip"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        configs = load_manifest(args.manifest)
+    except ValueError as e:
+        parser.error(f"manifeste illisible {args.manifest} : {e}")
+    if not configs:
+        parser.error(f"aucune configuration dans {args.manifest}")
+
+    try:
+        report = run_batch(
+            configs, args.output, bundle=args.bundle, workers=args.workers,
+            archive=args.archive, reproducible=args.reproducible
+        )
+    except ValueError as e:
+        parser.error(f"configuration invalide dans {args.manifest} : {e}")
+    print(
+        f"{report['generated']} kits générés ({report['requested']} demandés) "
+        f"en {report['seconds']:.2f}s - {report['kits_per_second']:.1f} kits/s",
+        file=sys.stderr
+    )
+    for path in report['outputs']:
+        print(path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""Cache de kits générés, adressé par le contenu de la configuration.
+
+Le niveau disque (optionnel) survit aux redémarrages : il est borné en octets,
+évince les fichiers les moins récemment lus et nomme chaque fichier d'après le
+format de son archive. Un kit daté change à chaque minute : seuls les kits
+reproductibles, identiques d'un processus à l'autre, y sont conservés (voir
+`kit_key` et `persistent_kits`).
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from . import resources
+from .packaging import FORMATS, reproducible_default, reproducible_mtime
+
+TMP_SUFFIX = '.tmp'
+
+
+def persistent_kits():
+    """Vrai si les kits produits peuvent être conservés sur disque (mode reproductible)"""
+    return reproducible_default()
+
+
+def kit_key(config):
+    """Clé d'un kit dans le cache : configuration, horodatage des entrées et extension du format"""
+    extension = FORMATS[config.archive].extension
+    if persistent_kits():
+        # SOURCE_DATE_EPOCH change les octets de l'archive : il fait partie de la clé
+        return f"{config.key}-{reproducible_mtime()}{extension}"
+    return f"{config.key}{extension}"
+
+
+class KitCache:
+    """Cache LRU borné en nombre d'entrées et en octets, avec niveau disque optionnel"""
+
+    def __init__(self, max_entries=64, max_bytes=64 * 1024 * 1024, disk_dir=None,
+                 max_disk_bytes=512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        # Fichiers du niveau disque et leur taille, du moins au plus récemment lu
+        self._disk = OrderedDict()
+        self._disk_size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._scan_disk()
+
+    def _scan_disk(self):
+        """Reprend les fichiers d'un processus précédent, dans l'ordre de leur dernière lecture"""
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.is_file() and not entry.name.endswith(TMP_SUFFIX):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._disk[name] = size
+            self._disk_size += size
+        with self._lock:
+            self._evict_disk()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key)
+
+    def _evict_disk(self):
+        """Supprime les fichiers les moins récemment lus au-delà de `max_disk_bytes`"""
+        while self._disk and self._disk_size > self.max_disk_bytes:
+            name, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            self.disk_evictions += 1
+            try:
+                os.remove(self._disk_path(name))
+            except OSError:
+                pass
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Date de dernière lecture : l'ordre LRU survit au redémarrage
+            os.utime(path)
+        except OSError:
+            return None
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            else:
+                # Fichier écrit par un autre processus partageant le répertoire
+                self._disk[key] = len(data)
+                self._disk_size += len(data)
+                self._evict_disk()
+        return data
+
+    def _write_disk(self, key, data):
+        if not self.disk_dir or len(data) > self.max_disk_bytes:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}{TMP_SUFFIX}"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Le niveau disque est un bonus : une erreur d'écriture ne doit pas casser la génération
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        with self._lock:
+            self._disk_size += len(data) - self._disk.pop(key, 0)
+            self._disk[key] = len(data)
+            self._evict_disk()
+
+    def _store(self, key, data):
+        """Insère en mémoire puis évince les entrées les moins récemment utilisées"""
+        if len(data) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = data
+        self._size += len(data)
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def get(self, key):
+        """Renvoie les octets du kit ou None"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, data)
+            return data
+
+    def peek(self, key):
+        """Octets du kit s'il est en mémoire, sans compter d'accès ni lire le disque"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key, data):
+        """Enregistre un kit en mémoire et, si configuré, sur disque"""
+        with self._lock:
+            self._store(key, data)
+        self._write_disk(key, data)
+
+    def clear(self):
+        """Vide le niveau mémoire (le niveau disque est conservé)"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """Compteurs et empreinte courante du cache"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_evictions': self.disk_evictions,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'disk_entries': len(self._disk),
+                'disk_bytes': self._disk_size,
+                'max_disk_bytes': self.max_disk_bytes,
+            }
+
+
+def create_kit_cache():
+    """Cache de kits du processus (interface et service), réglé par l'environnement
+
+    Plafonds : SECURE_RAG_KIT_CACHE_MAX_ENTRIES / _MAX_MB en mémoire et
+    SECURE_RAG_KIT_CACHE_DISK_MAX_MB sur disque. Le niveau disque (SECURE_RAG_CACHE_DIR)
+    est réservé aux kits reproductibles : un kit daté y garderait sa date de génération.
+    """
+    cache = KitCache(
+        max_entries=resources.limit_entries('kit_cache', 64),
+        max_bytes=resources.limit_bytes('kit_cache', 64),
+        disk_dir=(os.environ.get('SECURE_RAG_CACHE_DIR') or None) if persistent_kits() else None,
+        max_disk_bytes=resources.limit_bytes('kit_cache_disk', 512)
+    )
+    resources.register('kit_cache', cache.stats)
+    return cache
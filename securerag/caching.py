@@ -0,0 +1,71 @@
+"""Cache des réponses et des embeddings de requêtes, pour les objectifs conversationnels.
+
+Deux niveaux de réponse : correspondance exacte (hachage de la question normalisée)
+puis similarité sémantique (question déjà posée la plus proche, au-delà d'un seuil
+cosinus). L'embedding de chaque question est aussi conservé : une question répétée
+ne repaie ni l'appel d'embedding, ni la recherche, ni la complétion.
+
+Avec des données personnelles, les entrées sont cloisonnées par utilisateur, leur
+durée de vie est raccourcie et le cache n'est jamais écrit sur disque.
+"""
+from dataclasses import dataclass
+
+from .ingestion import PII_DATA
+
+# Objectifs dont les questions se répètent assez pour justifier un cache
+CACHED_OBJECTIVES = frozenset({'search', 'assistant'})
+
+# Redis avec le module de recherche vectorielle (index HNSW des questions)
+CACHE_IMAGE = 'redis/redis-stack-server:7.4.0-v1'
+CACHE_MEMORY_MB = 1024
+# Marge du conteneur au-delà de maxmemory (tampons clients, fragmentation)
+CACHE_OVERHEAD_MB = 256
+# Durée de vie des réponses (s) et seuil de similarité, selon l'objectif : une
+# réponse d'assistant vieillit plus vite et tolère moins l'approximation
+ANSWER_TTL = {'search': 86_400, 'assistant': 3_600}
+SIMILARITY = {'search': 0.92, 'assistant': 0.95}
+EMBEDDING_TTL = 7 * 86_400
+PERSONAL_ANSWER_TTL = 900
+# Taille moyenne d'une réponse en cache (question, réponse, métadonnées)
+ANSWER_BYTES = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class ResponseCache:
+    """Réglages du cache de réponses et d'embeddings, injectés dans les gabarits du kit"""
+
+    # 'shared' : entrées communes à tous ; 'user' : cloisonnées par utilisateur
+    scope: str
+    answer_ttl: int
+    embedding_ttl: int
+    similarity: float
+    embedding_dim: int
+    # Instantanés RDB ; désactivés pour les données personnelles
+    persistence: bool
+    memory_mb: int = CACHE_MEMORY_MB
+    eviction: str = 'allkeys-lru'
+    image: str = CACHE_IMAGE
+
+    @property
+    def container_memory_mb(self):
+        return self.memory_mb + CACHE_OVERHEAD_MB
+
+    @property
+    def capacity(self):
+        """Réponses conservées avant éviction : embedding (cache et index) et texte"""
+        return self.memory_mb * 1024 * 1024 // (2 * self.embedding_dim * 4 + ANSWER_BYTES)
+
+
+def plan_cache(objective, data_types, embedding_dim):
+    """Cache de l'objectif, cloisonné si les données sont personnelles ; None si sans objet"""
+    if objective not in CACHED_OBJECTIVES:
+        return None
+    personal = bool(PII_DATA.intersection(data_types))
+    return ResponseCache(
+        scope='user' if personal else 'shared',
+        answer_ttl=PERSONAL_ANSWER_TTL if personal else ANSWER_TTL[objective],
+        embedding_ttl=PERSONAL_ANSWER_TTL if personal else EMBEDDING_TTL,
+        similarity=SIMILARITY[objective],
+        embedding_dim=embedding_dim,
+        persistence=not personal,
+    )
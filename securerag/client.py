@@ -0,0 +1,156 @@
+"""Client du service HTTP de génération, avec l'interface de KitJobManager.
+
+L'application Streamlit l'utilise quand SECURE_RAG_SERVICE_URL est défini : la
+génération tourne alors dans le service, dimensionné indépendamment de l'UI.
+"""
+import threading
+import time
+
+import requests
+
+# Attente maximale d'un appel long-polling à GET /kits/{id}?wait=...
+POLL_SECONDS = 1.0
+
+
+class RemoteKitJob:
+    """Job exécuté par le service, avec la même interface que KitJob"""
+
+    def __init__(self, manager, config):
+        self.key = config.key
+        self.config = config
+        self._manager = manager
+        self._status = {'state': 'pending', 'stage': "Envoi au service de génération...", 'progress': 0.0}
+        self._submitted = False
+        self._retry_at = 0.0
+        self._data = None
+
+    def _submit(self):
+        response = self._manager.request('post', '/kits', params={'async': '1'}, json=self.config.to_dict())
+        if response.status_code == 503:
+            # Contre-pression : on repropose après le délai indiqué par le service
+            self._retry_at = time.monotonic() + float(response.headers.get('Retry-After', 1))
+            self._status = {'state': 'pending', 'stage': "Service saturé, nouvelle tentative...", 'progress': 0.0}
+            return
+        response.raise_for_status()
+        self._status = response.json()
+        self._submitted = True
+
+    def _fail(self, exc):
+        self._status = {'state': 'failed', 'stage': '', 'progress': 0.0, 'error': f"service de génération : {exc}"}
+
+    def _poll(self, timeout):
+        if not self._submitted:
+            delay = self._retry_at - time.monotonic()
+            if delay > 0:
+                time.sleep(min(delay, timeout))
+                return
+            self._submit()
+            return
+        response = self._manager.request('get', f'/kits/{self.key}', params={'wait': timeout})
+        if response.status_code == 404:
+            # Job expiré côté service : on le resoumet
+            self._submitted = False
+            return
+        response.raise_for_status()
+        self._status = response.json()
+
+    def progress(self):
+        return self._status.get('stage', ''), self._status.get('progress', 0.0)
+
+    def wait(self, timeout=None):
+        """Attend la fin du job au plus `timeout` secondes ; renvoie True s'il est terminé"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.done():
+            remaining = POLL_SECONDS if deadline is None else deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                self._poll(min(remaining, POLL_SECONDS))
+            except requests.RequestException as e:
+                self._fail(e)
+        return self.done()
+
+    def done(self):
+        return self._status['state'] in ('done', 'failed', 'cancelled')
+
+    def cancelled(self):
+        return self._status['state'] == 'cancelled'
+
+    def exception(self):
+        if self._status['state'] != 'failed':
+            return None
+        return RuntimeError(self._status.get('error', 'échec de la génération'))
+
+    def _fetch(self):
+        """Télécharge l'archive ; False si le job a expiré côté service et doit être resoumis"""
+        try:
+            response = self._manager.request('get', f'/kits/{self.key}/archive')
+            if response.status_code == 404:
+                self._submitted = False
+                self._status = {'state': 'pending', 'stage': "Job expiré, nouvelle soumission...", 'progress': 0.0}
+                return False
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self._fail(e)
+            return True
+        self._data = response.content
+        return True
+
+    def result(self, timeout=None):
+        # Une seule resoumission si le job a expiré entre sa fin et le téléchargement
+        for _ in range(2):
+            if not self.wait(timeout):
+                raise TimeoutError(f"kit {self.key[:12]} non disponible")
+            if self.exception() is not None:
+                raise self.exception()
+            if self._data is not None or self._fetch():
+                break
+        else:
+            self._fail("job expiré avant le téléchargement de l'archive")
+        if self.exception() is not None:
+            raise self.exception()
+        return self._data
+
+
+class RemoteKitJobManager:
+    """Soumet les générations au service HTTP (même interface que KitJobManager)"""
+
+    def __init__(self, base_url, timeout=10.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        # Une session (et son pool de connexions) par thread
+        self._local = threading.local()
+
+    def request(self, method, path, **kwargs):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        # Le délai réseau s'ajoute à l'attente demandée au service
+        timeout = self.timeout + float(kwargs.get('params', {}).get('wait', 0))
+        return session.request(method, f"{self.base_url}{path}", timeout=timeout, **kwargs)
+
+    def submit(self, config):
+        job = RemoteKitJob(self, config)
+        try:
+            job._submit()
+        except requests.RequestException as e:
+            job._fail(e)
+        return job
+
+    def release(self, job):
+        """Abandonne le job côté service, une seule fois et seulement s'il y est inscrit"""
+        # Un DELETE sans inscription décompterait l'abonnement d'un autre demandeur
+        if not job._submitted:
+            return
+        job._submitted = False
+        try:
+            self.request('delete', f'/kits/{job.key}')
+        except requests.RequestException:
+            pass
+
+    def running(self):
+        """Nombre de générations en vol dans le service (0 s'il est injoignable)"""
+        try:
+            return self.request('get', '/healthz').json()['running']
+        except (requests.RequestException, ValueError, KeyError):
+            return 0
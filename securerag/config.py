@@ -0,0 +1,181 @@
+"""Configuration d'un kit : modèle immuable, validé et canonique, utilisé comme clé de cache et de job."""
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+from .caching import plan_cache
+from .packaging import default_format, resolve_format
+from .provisioning import (
+    AZURE_REGIONS, DEFAULT_COMPLETION_TOKENS, DEFAULT_PROMPT_TOKENS, DEFAULT_REGION, DEFAULT_REGION_COUNT,
+    REGION_COUNTS, plan_openai
+)
+from .sizing import (
+    DEFAULT_CORPUS_SIZE, DEFAULT_EMBEDDING_DIM, DEFAULT_LATENCY_MS, DEFAULT_NODE_MEMORY_GB,
+    DEFAULT_REPLICATION_FACTOR, DEFAULT_TARGET_QPS, DEFAULT_TOPOLOGY, MAX_CORPUS_SIZE, TOPOLOGIES, estimate
+)
+from .vectorizers import DEFAULT_VECTORIZER, TRANSFORMERS_DIM, VECTORIZERS, plan_inference
+
+# Options proposées par le wizard, dans leur ordre d'affichage (ordre canonique)
+OBJECTIVES = ('search', 'assistant', 'synthesis', 'analysis')
+DATA_TYPES = ('hr', 'legal', 'financial', 'personal', 'public', 'technical')
+SECURITY_OPTIONS = ('sso', 'audit', 'encryption', 'rbac', 'gdpr', 'minimal')
+
+HIGH_SENSITIVITY_DATA = frozenset({'personal', 'financial', 'legal'})
+GDPR_DATA = frozenset({'personal', 'financial'})
+
+# Charge attendue (étape de dimensionnement) et valeurs par défaut
+SIZING_DEFAULTS = {
+    'corpus_size': DEFAULT_CORPUS_SIZE,
+    'embedding_dim': DEFAULT_EMBEDDING_DIM,
+    'target_qps': DEFAULT_TARGET_QPS,
+    'latency_ms': DEFAULT_LATENCY_MS,
+    'node_memory_gb': DEFAULT_NODE_MEMORY_GB,
+    'topology': DEFAULT_TOPOLOGY,
+    'replication_factor': DEFAULT_REPLICATION_FACTOR,
+    'vectorizer': DEFAULT_VECTORIZER,
+    'prompt_tokens': DEFAULT_PROMPT_TOKENS,
+    'completion_tokens': DEFAULT_COMPLETION_TOKENS,
+    'region': DEFAULT_REGION,
+    'region_count': DEFAULT_REGION_COUNT,
+}
+# Champs à choix de l'étape de dimensionnement ; les autres sont des entiers positifs
+SIZING_CHOICES = {
+    'topology': TOPOLOGIES,
+    'vectorizer': VECTORIZERS,
+    'region': AZURE_REGIONS,
+    'region_count': REGION_COUNTS,
+}
+# Bornes supérieures des champs entiers : une saisie démesurée est rejetée avant le calcul
+SIZING_MAXIMUMS = {
+    'corpus_size': MAX_CORPUS_SIZE,
+}
+
+
+def _canonical(values, allowed, field_name):
+    """Dédoublonne et trie selon l'ordre du wizard ; rejette les valeurs inconnues"""
+    # Une chaîne est itérable : 'legal' deviendrait {'l', 'e', 'g', 'a'}
+    if isinstance(values, (str, bytes)):
+        raise ValueError(f"{field_name} : liste de valeurs attendue, reçu {values!r}")
+    try:
+        selected = set(values)
+    except TypeError:
+        raise ValueError(f"{field_name} : liste de valeurs attendue, reçu {values!r}")
+    unknown = selected.difference(allowed)
+    if unknown:
+        raise ValueError(f"{field_name} : valeur(s) inconnue(s) {sorted(unknown)}")
+    return tuple(value for value in allowed if value in selected)
+
+
+def _positive(value, field_name, maximum=None):
+    """Entier strictement positif, au plus `maximum` ; rejette les autres valeurs"""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field_name} : entier attendu, reçu {value!r}")
+    if number <= 0:
+        raise ValueError(f"{field_name} : entier strictement positif attendu, reçu {value!r}")
+    if maximum is not None and number > maximum:
+        raise ValueError(f"{field_name} : au plus {maximum}, reçu {value!r}")
+    return number
+
+
+@dataclass(frozen=True, slots=True)
+class KitConfig:
+    """Configuration validée une seule fois, avec ses attributs dérivés précalculés"""
+
+    objective: str
+    data_types: tuple = ()
+    security_level: tuple = ()
+    # Format d'archive ou politique (fastest, balanced, smallest) ; défaut du déploiement sinon
+    archive: str = field(default_factory=default_format)
+    # Charge attendue, base du dimensionnement de Weaviate
+    corpus_size: int = DEFAULT_CORPUS_SIZE
+    embedding_dim: int = DEFAULT_EMBEDDING_DIM
+    target_qps: int = DEFAULT_TARGET_QPS
+    latency_ms: int = DEFAULT_LATENCY_MS
+    node_memory_gb: int = DEFAULT_NODE_MEMORY_GB
+    # Nœud unique ou cluster shardé et répliqué
+    topology: str = DEFAULT_TOPOLOGY
+    replication_factor: int = DEFAULT_REPLICATION_FACTOR
+    # API OpenAI ou inférence locale sur CPU
+    vectorizer: str = DEFAULT_VECTORIZER
+    # Taille moyenne des échanges avec le modèle, et placement Azure OpenAI
+    prompt_tokens: int = DEFAULT_PROMPT_TOKENS
+    completion_tokens: int = DEFAULT_COMPLETION_TOKENS
+    region: str = DEFAULT_REGION
+    region_count: int = DEFAULT_REGION_COUNT
+    # Attributs dérivés, calculés à la construction
+    data_sensitivity: str = field(init=False, compare=False)
+    gdpr_relevant: bool = field(init=False, compare=False)
+    anonymous_access: bool = field(init=False, compare=False)
+    encryption_at_rest: bool = field(init=False, compare=False)
+    sizing: object = field(init=False, compare=False)
+    inference: object = field(init=False, compare=False)
+    response_cache: object = field(init=False, compare=False)
+    openai_plan: object = field(init=False, compare=False)
+    key: str = field(init=False, compare=False)
+
+    def __post_init__(self):
+        if self.objective not in OBJECTIVES:
+            raise ValueError(f"objective : valeur inconnue {self.objective!r}")
+        data_types = _canonical(self.data_types, DATA_TYPES, 'data_types')
+        security_level = _canonical(self.security_level, SECURITY_OPTIONS, 'security_level')
+        selected = frozenset(data_types)
+
+        # Instance gelée : les attributs sont posés via object.__setattr__
+        object.__setattr__(self, 'data_types', data_types)
+        object.__setattr__(self, 'security_level', security_level)
+        object.__setattr__(self, 'archive', resolve_format(self.archive))
+        for name in SIZING_DEFAULTS:
+            value = getattr(self, name)
+            if name not in SIZING_CHOICES:
+                object.__setattr__(self, name, _positive(value, name, SIZING_MAXIMUMS.get(name)))
+            elif value not in SIZING_CHOICES[name]:
+                raise ValueError(f"{name} : valeur inconnue {value!r}")
+        if self.topology == 'single':
+            # Sans cluster, pas de réplication : même clé quel que soit le facteur saisi
+            object.__setattr__(self, 'replication_factor', 1)
+        if self.vectorizer == 'transformers':
+            # La dimension est celle du modèle embarqué
+            object.__setattr__(self, 'embedding_dim', TRANSFORMERS_DIM)
+        object.__setattr__(self, 'data_sensitivity', 'High' if selected & HIGH_SENSITIVITY_DATA else 'Medium')
+        object.__setattr__(self, 'gdpr_relevant', bool(selected & GDPR_DATA))
+        object.__setattr__(self, 'anonymous_access', 'sso' not in security_level)
+        object.__setattr__(self, 'encryption_at_rest', 'encryption' in security_level)
+        object.__setattr__(self, 'sizing', estimate(
+            self.corpus_size, self.embedding_dim, self.target_qps, self.latency_ms, self.node_memory_gb,
+            self.topology, self.replication_factor
+        ))
+        object.__setattr__(self, 'inference', plan_inference(
+            self.vectorizer, self.objective, self.target_qps, data_types
+        ))
+        object.__setattr__(self, 'response_cache', plan_cache(self.objective, data_types, self.embedding_dim))
+        object.__setattr__(self, 'openai_plan', plan_openai(
+            self.target_qps, self.prompt_tokens, self.completion_tokens, self.region, self.region_count,
+            self.vectorizer, self.embedding_dim
+        ))
+        object.__setattr__(self, 'key', hashlib.sha256(self.canonical_json().encode('utf-8')).hexdigest())
+
+    @classmethod
+    def from_dict(cls, data):
+        """Construit une configuration depuis un dict (session, manifeste, requête HTTP)"""
+        return cls(
+            objective=data.get('objective', ''),
+            data_types=data.get('data_types', ()),
+            security_level=data.get('security_level', ()),
+            archive=data.get('archive') or default_format(),
+            **{name: data.get(name, default) for name, default in SIZING_DEFAULTS.items()}
+        )
+
+    def to_dict(self):
+        return {
+            'objective': self.objective,
+            'data_types': list(self.data_types),
+            'security_level': list(self.security_level),
+            'archive': self.archive,
+            **{name: getattr(self, name) for name in SIZING_DEFAULTS},
+        }
+
+    def canonical_json(self):
+        """Sérialisation stable, base de la clé de contenu"""
+        return json.dumps(self.to_dict(), sort_keys=True, separators=(',', ':'))
@@ -0,0 +1,46 @@
+"""Moteur de templates partagé : un seul Environment Jinja2 compilé par processus."""
+import os
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, StrictUndefined
+
+from . import resources
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+
+def _bytecode_cache():
+    """Cache de bytecode sur disque pour éviter le parsing au démarrage à froid"""
+    directory = os.environ.get('SECURE_RAG_TEMPLATE_CACHE_DIR')
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Sans répertoire explicite, Jinja2 utilise un dossier temporaire propre à l'utilisateur
+    return FileSystemBytecodeCache(directory or None, pattern='secure-rag-%s.cache')
+
+
+env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    bytecode_cache=_bytecode_cache(),
+    auto_reload=False,
+    cache_size=resources.limit_entries('templates', 400),
+    keep_trailing_newline=True,
+    undefined=StrictUndefined,
+)
+
+
+def stats():
+    """Templates compilés conservés en mémoire"""
+    return {'entries': len(env.cache), 'max_entries': env.cache.capacity}
+
+
+resources.register('templates', stats)
+
+
+def render(name, **context):
+    """Rend un template du kit (compilé une seule fois, puis servi depuis le cache)"""
+    return env.get_template(name).render(**context)
+
+
+def precompile():
+    """Compile tous les templates du kit à l'avance"""
+    for name in env.list_templates(extensions=['j2']):
+        env.get_template(name)
@@ -0,0 +1,55 @@
+"""Rendu incrémental des artefacts : chaque fichier est assemblé à partir de fragments.
+
+Un fragment déclare les attributs de KitConfig dont il dépend ; son rendu est mis
+en cache sur ces seules valeurs. Modifier une option ne re-rend donc que les
+fragments concernés, le reste du fichier est ressoudé depuis le cache.
+"""
+from dataclasses import dataclass
+
+from .cache import KitCache
+from . import resources
+from .engine import render as render_template
+
+# Cache des fragments rendus, partagé par le processus
+fragment_cache = KitCache(
+    max_entries=resources.limit_entries('fragment_cache', 4096),
+    max_bytes=resources.limit_bytes('fragment_cache', 16)
+)
+resources.register('fragment_cache', fragment_cache.stats)
+
+
+@dataclass(frozen=True, slots=True)
+class Fragment:
+    """Bloc de template rendu à partir des valeurs dont il dépend
+
+    Les noms de `depends_on` désignent des attributs de KitConfig ou des valeurs
+    fournies à l'appel (horodatage...) ; ils forment la clé de cache du fragment.
+    """
+
+    template: str
+    depends_on: tuple = ()
+    # Contexte de rendu calculé à partir des valeurs ; par défaut, les valeurs elles-mêmes
+    context: object = None
+
+    def render(self, config, extra):
+        values = {
+            name: extra[name] if name in extra else getattr(config, name)
+            for name in self.depends_on
+        }
+        key = (self.template,) + tuple(values.values())
+        text = fragment_cache.get(key)
+        if text is None:
+            context = self.context(values) if self.context is not None else values
+            text = render_template(self.template, **context)
+            fragment_cache.put(key, text)
+        return text
+
+
+def render_fragments(fragments, config, **extra):
+    """Assemble un artefact ; les fragments vides (blocs désactivés) sont omis"""
+    parts = []
+    for fragment in fragments:
+        text = fragment.render(config, extra)
+        if text.strip():
+            parts.append(text)
+    return '\n'.join(parts)
@@ -0,0 +1,97 @@
+"""Génération des artefacts du kit et assemblage de l'archive, sans dépendance à Streamlit."""
+from datetime import datetime
+
+from .metrics import metrics
+from .packaging import ArchiveWriter, ChunkSink, reproducible_default, reproducible_mtime
+from .registry import ArtifactGenerator, GeneratorRegistry, render_all
+# Réexporté : le résumé ne dépend pas du moteur de gabarits
+from .summary import generate_config_summary  # noqa: F401
+
+
+def format_generated_at(generated_at=None):
+    """Horodatage du README : maintenant si None, omis si chaîne vide, sinon injecté"""
+    if generated_at is None:
+        generated_at = datetime.now()
+    if isinstance(generated_at, datetime):
+        return generated_at.strftime('%d/%m/%Y à %H:%M')
+    return generated_at
+
+
+# Générateurs du kit, dans l'ordre d'écriture de l'archive. Chacun est importé au
+# premier kit qui le sélectionne ; un artefact vide n'est pas écrit. Les générateurs
+# acceptent les options de build communes (generated_at...) et ignorent les autres.
+KIT_ARTIFACTS = GeneratorRegistry([
+    ArtifactGenerator('main.tf', 'securerag.artifacts.azure:generate_terraform_config'),
+    ArtifactGenerator('weaviate-config.yaml', 'securerag.artifacts.weaviate:generate_weaviate_config'),
+    ArtifactGenerator('weaviate-schema.json', 'securerag.artifacts.weaviate:generate_weaviate_schema'),
+    ArtifactGenerator('ingest.py', 'securerag.artifacts.scripts:generate_ingest_script'),
+    # Cache des réponses : objectifs de recherche et d'assistant uniquement
+    ArtifactGenerator(
+        'rag_cache.py', 'securerag.artifacts.rag_cache:generate_rag_cache',
+        when=lambda config: config.response_cache is not None
+    ),
+    ArtifactGenerator('loadtest.py', 'securerag.artifacts.scripts:generate_loadtest_script'),
+    ArtifactGenerator('README.md', 'securerag.artifacts.readme:generate_readme'),
+])
+
+
+def _build_options(reproducible, generated_at):
+    """Horodatage des entrées et options de rendu d'un build"""
+    if reproducible is None:
+        reproducible = reproducible_default()
+    if not reproducible:
+        return None, {'generated_at': format_generated_at(generated_at)}
+    # Mode reproductible : horodatage du README omis sauf s'il est injecté
+    return reproducible_mtime(), {'generated_at': format_generated_at(generated_at or '')}
+
+
+def iter_secure_kit(config, on_progress=None, reproducible=None, generated_at=None):
+    """Génère le kit en flux : produit les morceaux compressés au fil des artefacts
+
+    `on_progress(étape, terminées, total)` est appelé au début de chaque étape
+    réelle du pipeline puis une dernière fois quand l'archive est prête.
+    En mode reproductible (par défaut : SECURE_RAG_REPRODUCIBLE), les entrées ont un
+    horodatage fixe et le README n'est daté que si `generated_at` est fourni.
+    """
+    mtime, options = _build_options(reproducible, generated_at)
+    generators = KIT_ARTIFACTS.select(config)
+    total = len(generators) + 1
+    sink = ChunkSink()
+    metrics.increment('kits_generated')
+    with ArchiveWriter(sink, config.archive, mtime) as writer:
+        # Compression de chaque artefact pendant le rendu des suivants
+        results = render_all(generators, config, **options)
+        try:
+            for i, (generator, result) in enumerate(zip(generators, results)):
+                if on_progress:
+                    on_progress(f"Génération de {generator.output}...", i, total)
+                content = result.result()
+                if not content:
+                    continue
+                with metrics.span(f'compress.{generator.output}'):
+                    writer.add(generator.output, content)
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+        finally:
+            # Flux fermé avant la fin : les rendus pas encore commencés sont abandonnés
+            for result in results:
+                result.cancel()
+        if on_progress:
+            on_progress("Finalisation de l'archive...", total - 1, total)
+    # Fin d'archive (répertoire central, bloc final) écrite à la fermeture
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
+    if on_progress:
+        on_progress("Kit prêt", total, total)
+
+
+def generate_secure_kit(config, on_progress=None, reproducible=None, generated_at=None):
+    """Génère un kit RAG sécurisé (archive construite en mémoire, au format config.archive)
+
+    Mêmes octets que `iter_secure_kit` : un kit a la même empreinte, qu'il soit servi
+    en flux ou depuis le cache.
+    """
+    with metrics.span('kit.generate'):
+        return b''.join(iter_secure_kit(config, on_progress, reproducible, generated_at))
@@ -0,0 +1,44 @@
+"""Profil du script d'ingestion livré dans le kit, selon l'objectif et les données choisis."""
+from .labels import DATA_TYPE_LABELS, OBJECTIVE_LABELS
+
+# Taille des passages et chevauchement (caractères) : passages courts pour la
+# recherche, contexte plus large pour la synthèse
+CHUNKING = {
+    'search': (500, 100),
+    'assistant': (800, 150),
+    'synthesis': (2000, 200),
+    'analysis': (1200, 200),
+}
+
+# Formats texte lus pour chaque type de données
+EXTENSIONS = {
+    'hr': ('.txt', '.md', '.csv'),
+    'legal': ('.txt', '.md', '.html'),
+    'financial': ('.txt', '.csv', '.json'),
+    'personal': ('.txt', '.md', '.csv', '.json'),
+    'public': ('.txt', '.md', '.html'),
+    'technical': ('.txt', '.md', '.rst', '.json', '.yaml', '.py'),
+}
+
+# Données dont les identifiants personnels sont masqués avant l'indexation
+PII_DATA = frozenset({'personal', 'hr', 'financial'})
+
+
+def ingest_context(values):
+    """Contexte de rendu de ingest.py"""
+    data_types = values['data_types']
+    sizing = values['sizing']
+    chunk_size, chunk_overlap = CHUNKING.get(values['objective'], CHUNKING['search'])
+    extensions = sorted({ext for dt in data_types for ext in EXTENSIONS.get(dt, ())}) or ['.md', '.txt']
+    return {
+        'objective_label': OBJECTIVE_LABELS.get(values['objective'], 'Non défini'),
+        'data_type_labels': [DATA_TYPE_LABELS.get(dt, dt) for dt in data_types],
+        'chunk_size': chunk_size,
+        'chunk_overlap': chunk_overlap,
+        'extensions': extensions,
+        'redact_pii': bool(PII_DATA.intersection(data_types)),
+        'batch_size': values['inference'].batch_size,
+        # Deux lots en vol par nœud : l'indexation HNSW se parallélise sur les nœuds
+        'concurrency': max(2, sizing.nodes * 2),
+        'consistency_level': 'QUORUM' if sizing.replication_factor > 1 else 'ONE',
+    }
@@ -0,0 +1,153 @@
+"""Génération de kits en arrière-plan, avec une progression issue du pipeline réel."""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from .cache import kit_key
+
+
+class Saturated(RuntimeError):
+    """Pool de génération saturé : la demande doit être reproposée plus tard"""
+
+
+class KitJob:
+    """Génération d'un kit soumise au pool, avec ses événements de progression"""
+
+    def __init__(self, config):
+        self.key = config.key
+        self.config = config
+        self.future = None
+        self.subscribers = 0
+        self._events = []
+        self._lock = threading.Lock()
+
+    def record(self, stage, completed, total):
+        """Enregistre une étape du pipeline (compatible avec `on_progress`)"""
+        with self._lock:
+            self._events.append((stage, completed / total))
+
+    def progress(self):
+        """Dernière étape atteinte : (libellé, fraction entre 0 et 1)"""
+        with self._lock:
+            if not self._events:
+                return "En attente d'un worker...", 0.0
+            return self._events[-1]
+
+    def wait(self, timeout=None):
+        """Attend la fin du job au plus `timeout` secondes ; renvoie True s'il est terminé"""
+        wait([self.future], timeout=timeout)
+        return self.future.done()
+
+    def done(self):
+        return self.future.done()
+
+    def cancelled(self):
+        return self.future.cancelled()
+
+    def exception(self):
+        if not self.future.done() or self.future.cancelled():
+            return None
+        return self.future.exception()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+    def status(self):
+        """État sérialisable du job (service HTTP)"""
+        stage, fraction = self.progress()
+        if self.future.cancelled():
+            state = 'cancelled'
+        elif not self.future.done():
+            state = 'running' if self.future.running() else 'pending'
+        elif self.future.exception() is not None:
+            state = 'failed'
+        else:
+            state = 'done'
+        status = {'id': self.key, 'state': state, 'stage': stage, 'progress': fraction}
+        if state == 'failed':
+            status['error'] = str(self.future.exception())
+        return status
+
+
+class KitJobManager:
+    """Pool de génération partagé : un seul job en vol par configuration
+
+    Avec `max_pending`, au-delà de ce nombre de jobs en vol, une nouvelle
+    génération lève Saturated ; les kits en cache et les jobs en vol restent servis.
+    """
+
+    def __init__(self, cache, max_workers=4, max_pending=None):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='kit-job')
+        self._running = {}
+        # Réentrant : l'annulation sous verrou déclenche aussitôt le callback _forget
+        self._lock = threading.RLock()
+
+    def submit(self, config):
+        """Lance (ou rejoint) la génération du kit correspondant à une KitConfig"""
+        key = config.key
+        data = self.cache.get(kit_key(config))
+        if data is not None:
+            # Kit déjà en cache : job terminé d'emblée, sans passer par le pool
+            job = KitJob(config)
+            job.subscribers = 1
+            job.record("Kit servi depuis le cache", 1, 1)
+            job.future = Future()
+            job.future.set_result(data)
+            return job
+        with self._lock:
+            job = self._running.get(key)
+            if job is not None:
+                job.subscribers += 1
+                return job
+            if self.max_pending is not None and len(self._running) >= self.max_pending:
+                raise Saturated(f"{len(self._running)} générations en cours")
+            job = KitJob(config)
+            job.subscribers = 1
+            job.future = self._executor.submit(self._run, job)
+            self._running[key] = job
+        # Hors du verrou : le callback s'exécute immédiatement si le job est déjà fini
+        job.future.add_done_callback(lambda _: self._forget(job))
+        return job
+
+    def release(self, job):
+        """Abandonne un job devenu inutile ; il est annulé s'il n'a plus d'abonné et n'a pas démarré"""
+        with self._lock:
+            job.subscribers -= 1
+            if job.subscribers > 0:
+                return
+            # Sous le verrou de submit : un appel concurrent ne peut pas rejoindre un job
+            # en cours d'annulation. Un job déjà démarré va à son terme et alimente le cache.
+            job.future.cancel()
+
+    def _forget(self, job):
+        with self._lock:
+            if self._running.get(job.key) is job:
+                del self._running[job.key]
+
+    def _run(self, job):
+        # submit() a déjà compté l'échec : on vérifie seulement qu'un autre chemin
+        # (génération en flux) n'a pas produit le kit entre-temps
+        data = self.cache.peek(kit_key(job.config))
+        if data is not None:
+            job.record("Kit servi depuis le cache", 1, 1)
+            return data
+        # Import différé : jinja2 et le moteur de gabarits ne sont chargés qu'à la première génération
+        from .generator import generate_secure_kit
+        data = generate_secure_kit(job.config, on_progress=job.record)
+        self.cache.put(kit_key(job.config), data)
+        return data
+
+    def execute(self, fn, *args):
+        """Exécute `fn` sur le pool de génération (kits diffusés en flux par le service)"""
+        return self._executor.submit(fn, *args)
+
+    def running(self):
+        """Nombre de jobs en cours ou en attente"""
+        with self._lock:
+            return len(self._running)
+
+    def shutdown(self, wait=True):
+        """Arrête le pool ; les jobs qui n'ont pas démarré sont annulés"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
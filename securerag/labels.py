@@ -0,0 +1,58 @@
+"""Tables de libellés statiques, construites une seule fois par processus."""
+
+# Options du wizard (libellé, description et niveau de risque ou de priorité)
+OBJECTIVE_CHOICES = (
+    {"value": "search", "label": "🔍 Moteur de recherche interne", "desc": "Rechercher dans documents et bases de connaissances"},
+    {"value": "assistant", "label": "🤖 Assistant conversationnel métier", "desc": "RH, finance, support client..."},
+    {"value": "synthesis", "label": "📝 Génération de synthèses", "desc": "Résumés, rapports, documentation"},
+    {"value": "analysis", "label": "📊 Analyse de documents", "desc": "Contrats, PDF, données non-structurées"}
+)
+
+DATA_TYPE_CHOICES = (
+    {"value": "hr", "label": "👥 RH", "desc": "Fiches de poste, CV, entretiens", "risk": "medium"},
+    {"value": "legal", "label": "⚖️ Juridique", "desc": "Contrats, politiques internes", "risk": "high"},
+    {"value": "financial", "label": "💰 Financier", "desc": "Budgets, bilans, projections", "risk": "high"},
+    {"value": "personal", "label": "🔒 Données personnelles", "desc": "Emails, noms, adresses...", "risk": "high"},
+    {"value": "public", "label": "🌐 Données publiques", "desc": "Documentation, FAQ, guides", "risk": "low"},
+    {"value": "technical", "label": "⚙️ Technique", "desc": "Code, configurations, logs", "risk": "medium"}
+)
+
+SECURITY_CHOICES = (
+    {"value": "sso", "label": "🔑 Authentification SSO", "desc": "Azure AD, Google, SAML", "priority": "high"},
+    {"value": "audit", "label": "📋 Journalisation des accès", "desc": "Logs auditables et traçabilité", "priority": "high"},
+    {"value": "encryption", "label": "🔒 Chiffrement au repos", "desc": "KMS, Vault, clés rotatives", "priority": "high"},
+    {"value": "rbac", "label": "👥 Contrôle d'accès par rôle", "desc": "RBAC, politiques granulaires", "priority": "medium"},
+    {"value": "gdpr", "label": "🇪🇺 Conformité RGPD complète", "desc": "DPO, registres, procédures", "priority": "high"},
+    {"value": "minimal", "label": "⚡ Configuration minimale", "desc": "Pour test rapide", "priority": "low"}
+)
+
+LEVEL_BADGES = {"high": "🔴", "medium": "🟡", "low": "🟢"}
+RISK_LABELS = {"high": "Sensible", "medium": "Modéré", "low": "Public"}
+PRIORITY_LABELS = {"high": "Essentiel", "medium": "Recommandé", "low": "Optionnel"}
+TOPOLOGY_LABELS = {"single": "🖥️ Nœud unique", "cluster": "🌐 Cluster (shards répliqués)"}
+VECTORIZER_LABELS = {"openai": "☁️ API OpenAI", "transformers": "🔌 Modèle local sur CPU (hors ligne)"}
+REGION_LABELS = {
+    "westeurope": "🇳🇱 Europe de l'Ouest", "francecentral": "🇫🇷 France Centre", "swedencentral": "🇸🇪 Suède Centre",
+    "northeurope": "🇮🇪 Europe du Nord", "germanywestcentral": "🇩🇪 Allemagne Centre-Ouest"
+}
+
+# Libellés repris dans le README du kit
+OBJECTIVE_LABELS = {
+    'search': 'Moteur de recherche interne',
+    'assistant': 'Assistant conversationnel',
+    'synthesis': 'Génération de synthèses',
+    'analysis': 'Analyse de documents'
+}
+
+DATA_TYPE_LABELS = {
+    'hr': 'RH', 'legal': 'Juridique', 'financial': 'Financier',
+    'personal': 'Personnel', 'public': 'Public', 'technical': 'Technique'
+}
+
+# Lignes du récapitulatif
+OBJECTIVE_SUMMARIES = {
+    'search': '✅ Moteur de recherche interne optimisé',
+    'assistant': '✅ Assistant conversationnel intelligent',
+    'synthesis': '✅ Générateur de synthèses automatique',
+    'analysis': '✅ Analyseur de documents avancé'
+}
@@ -0,0 +1,42 @@
+"""Profil du test de charge livré dans le kit : mélange de requêtes et budget de latence."""
+import math
+
+from .labels import OBJECTIVE_LABELS
+
+# Part de chaque type de requête selon l'objectif : mots-clés (bm25), vecteur
+# (plus proches voisins) ou hybride ; et nombre de passages demandés
+QUERY_MIX = {
+    'search': {'bm25': 0.4, 'hybrid': 0.3, 'vector': 0.3},
+    'assistant': {'hybrid': 0.5, 'vector': 0.4, 'bm25': 0.1},
+    'synthesis': {'vector': 0.6, 'hybrid': 0.4},
+    'analysis': {'vector': 0.5, 'bm25': 0.5},
+}
+QUERY_LIMIT = {'search': 10, 'assistant': 5, 'synthesis': 20, 'analysis': 20}
+# Durées par défaut (s) : chauffe des caches et de l'index, puis mesure
+WARMUP_SECONDS = 10
+DURATION_SECONDS = 60
+# Attributs de KitConfig dont dépendent loadtest.py et sa section du README
+LOADTEST_DEPENDS = ('objective', 'target_qps', 'latency_ms', 'embedding_dim', 'sizing', 'inference')
+
+
+def loadtest_context(values):
+    """Contexte de rendu de loadtest.py"""
+    objective = values['objective']
+    sizing = values['sizing']
+    # Loi de Little : requêtes en vol = débit x latence, avec une marge de 2
+    concurrency = max(4, 2 * math.ceil(values['target_qps'] * values['latency_ms'] / 1000))
+    urls = [f"http://localhost:{8080 + node}" for node in range(sizing.nodes)]
+    return {
+        'objective_label': OBJECTIVE_LABELS.get(objective, 'Non défini'),
+        'query_mix': QUERY_MIX.get(objective, QUERY_MIX['search']),
+        'query_limit': QUERY_LIMIT.get(objective, 10),
+        'target_qps': values['target_qps'],
+        'latency_ms': values['latency_ms'],
+        'embedding_dim': values['embedding_dim'],
+        # Sans inférence locale, la requête porte son vecteur : aucun appel à l'API
+        'local_inference': values['inference'].vectorizer == 'transformers',
+        'concurrency': concurrency,
+        'urls': urls,
+        'warmup_seconds': WARMUP_SECONDS,
+        'duration_seconds': DURATION_SECONDS,
+    }
@@ -0,0 +1,178 @@
+"""Instrumentation du chemin critique : durées par étape, compteurs et export.
+
+Activée par SECURE_RAG_METRICS=1. Désactivée, `span()` renvoie un gestionnaire
+de contexte partagé qui ne fait rien : le coût se limite à un test de booléen.
+
+Export :
+- SECURE_RAG_METRICS_FILE : fichier réécrit périodiquement (.json, sinon texte Prometheus)
+- SECURE_RAG_METRICS_PORT : point d'accès HTTP (/metrics en Prometheus, /metrics.json),
+  en écoute sur 127.0.0.1 ; SECURE_RAG_METRICS_HOST l'ouvre à d'autres interfaces
+  (0.0.0.0 pour un scraping depuis un autre conteneur)
+"""
+import json
+import os
+import threading
+import time
+
+PREFIX = 'securerag'
+
+
+class _NoopSpan:
+    """Span utilisé quand l'instrumentation est désactivée"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ('_metrics', '_name', '_start')
+
+    def __init__(self, metrics, name):
+        self._metrics = metrics
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        # Mesuré y compris quand l'étape se termine par st.rerun() (exception de contrôle)
+        self._metrics.observe(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class Metrics:
+    """Registre de durées (nombre, somme, max) et de compteurs, sûr entre threads"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._timings = {}
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+        self._last_export = 0.0
+
+    def span(self, name):
+        """Chronomètre un bloc : `with metrics.span('render.main.tf'): ...`"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name)
+
+    def observe(self, name, seconds):
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                self._timings[name] = [1, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                if seconds > timing[2]:
+                    timing[2] = seconds
+
+    def increment(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def register_gauges(self, name, provider):
+        """Expose les valeurs numériques du dict renvoyé par `provider()` (lu à l'export)"""
+        with self._lock:
+            self._gauges[name] = provider
+
+    def snapshot(self):
+        """État courant sous forme de dict sérialisable"""
+        with self._lock:
+            timings = {
+                name: {'count': count, 'sum_seconds': total, 'max_seconds': peak}
+                for name, (count, total, peak) in self._timings.items()
+            }
+            counters = dict(self._counters)
+            providers = dict(self._gauges)
+        gauges = {}
+        for name, provider in providers.items():
+            gauges[name] = {k: v for k, v in provider().items() if isinstance(v, (int, float))}
+        return {'timings': timings, 'counters': counters, 'gauges': gauges}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self):
+        """Format texte d'exposition Prometheus"""
+        snapshot = self.snapshot()
+        lines = [f'# TYPE {PREFIX}_span_seconds summary']
+        for name, timing in sorted(snapshot['timings'].items()):
+            lines.append(f'{PREFIX}_span_seconds_count{{span="{name}"}} {timing["count"]}')
+            lines.append(f'{PREFIX}_span_seconds_sum{{span="{name}"}} {timing["sum_seconds"]:.6f}')
+        lines.append(f'# TYPE {PREFIX}_span_seconds_max gauge')
+        for name, timing in sorted(snapshot['timings'].items()):
+            lines.append(f'{PREFIX}_span_seconds_max{{span="{name}"}} {timing["max_seconds"]:.6f}')
+        for name, value in sorted(snapshot['counters'].items()):
+            metric = f'{PREFIX}_{name}_total'
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {value}')
+        for group, values in sorted(snapshot['gauges'].items()):
+            for name, value in sorted(values.items()):
+                metric = f'{PREFIX}_{group}_{name}'
+                lines.append(f'# TYPE {metric} gauge')
+                lines.append(f'{metric} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def export_file(self, path, min_interval=5.0):
+        """Réécrit le fichier d'export, au plus une fois toutes les `min_interval` secondes"""
+        now = time.monotonic()
+        if not self.enabled or now - self._last_export < min_interval:
+            return
+        self._last_export = now
+        payload = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def reset(self):
+        with self._lock:
+            self._timings.clear()
+            self._counters.clear()
+
+
+def serve(metrics, port, host='127.0.0.1'):
+    """Démarre le point d'accès HTTP de scraping dans un thread démon
+
+    Local par défaut : les métriques révèlent la charge et les tailles de cache,
+    l'exposition au réseau est un choix explicite de l'appelant (`host`).
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                body, content_type = metrics.to_prometheus(), 'text/plain; version=0.0.4'
+            elif self.path == '/metrics.json':
+                body, content_type = metrics.to_json(), 'application/json'
+            else:
+                self.send_error(404)
+                return
+            data = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
+
+
+# Registre partagé par le processus (toutes les sessions Streamlit)
+metrics = Metrics(enabled=os.environ.get('SECURE_RAG_METRICS', '').lower() in ('1', 'true', 'yes'))
@@ -0,0 +1,192 @@
+"""Empaquetage du kit : formats d'archive, niveaux de compression et politiques.
+
+Le format se choisit par requête (attribut `archive` de KitConfig) ou pour tout
+le déploiement (SECURE_RAG_ARCHIVE). On peut nommer un format précis
+(`zip-deflate-9`, `tar.xz`...) ou une politique : `fastest`, `balanced`, `smallest`.
+"""
+import hashlib
+import io
+import os
+import time
+import zlib
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class ArchiveFormat:
+    """Format d'archive et réglage de compression
+
+    `compression` est un nom : méthode ZIP (stored, deflated, bzip2, lzma) ou
+    filtre du flux tar (gz, xz). Les modules correspondants ne sont importés
+    qu'à la première écriture, pas au chargement de l'interface.
+    """
+
+    name: str
+    kind: str
+    compression: str = None
+    level: object = None
+    extension: str = '.zip'
+    mime: str = 'application/zip'
+
+    def filename(self, stem):
+        return f"{stem}{self.extension}"
+
+
+FORMATS = {fmt.name: fmt for fmt in (
+    ArchiveFormat('zip-stored', 'zip', 'stored'),
+    ArchiveFormat('zip-deflate-1', 'zip', 'deflated', 1),
+    ArchiveFormat('zip', 'zip', 'deflated'),
+    ArchiveFormat('zip-deflate-9', 'zip', 'deflated', 9),
+    ArchiveFormat('zip-bzip2', 'zip', 'bzip2', 9),
+    ArchiveFormat('zip-lzma', 'zip', 'lzma'),
+    ArchiveFormat('tar.gz', 'tar', 'gz', 6, '.tar.gz', 'application/gzip'),
+    ArchiveFormat('tar.gz-9', 'tar', 'gz', 9, '.tar.gz', 'application/gzip'),
+    ArchiveFormat('tar.xz', 'tar', 'xz', 6, '.tar.xz', 'application/x-xz'),
+)}
+
+# Politiques : petits kits texte dominés par le coût de compression (fastest),
+# gros lots dominés par le volume transféré (smallest)
+POLICIES = {
+    'fastest': 'zip-stored',
+    'balanced': 'zip',
+    'smallest': 'tar.xz',
+}
+
+
+def resolve_format(name):
+    """Nom de format canonique pour un format ou une politique ; ValueError si inconnu"""
+    name = POLICIES.get(name, name)
+    if name not in FORMATS:
+        choices = sorted(FORMATS) + sorted(POLICIES)
+        raise ValueError(f"archive : format inconnu {name!r} (choix : {', '.join(choices)})")
+    return name
+
+
+def reproducible_mtime():
+    """Horodatage fixe des entrées en mode reproductible (SOURCE_DATE_EPOCH, sinon 1980-01-01)"""
+    # 1980-01-01 est la plus petite date représentable dans une archive ZIP
+    return max(int(os.environ.get('SOURCE_DATE_EPOCH', 315532800)), 315532800)
+
+
+def reproducible_default():
+    """Mode reproductible du déploiement (SECURE_RAG_REPRODUCIBLE)"""
+    return os.environ.get('SECURE_RAG_REPRODUCIBLE', '').lower() in ('1', 'true', 'yes')
+
+
+def kit_digest(data):
+    """Empreinte SHA-256 du contenu, utilisable comme ETag fort"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def default_format():
+    """Format du déploiement (SECURE_RAG_ARCHIVE), `zip` par défaut"""
+    return resolve_format(os.environ.get('SECURE_RAG_ARCHIVE', 'zip'))
+
+
+class ChunkSink:
+    """Flux en écriture seule qui accumule les octets produits par l'archive"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _CompressingSink:
+    """Compresse à la volée le flux tar (gzip ou xz, au niveau demandé)"""
+
+    def __init__(self, fileobj, compressor):
+        self._fileobj = fileobj
+        self._compressor = compressor
+
+    def write(self, data):
+        self._fileobj.write(self._compressor.compress(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self._fileobj.write(self._compressor.flush())
+
+
+class ArchiveWriter:
+    """Écrit les artefacts d'un kit dans `fileobj`, positionnable ou non
+
+    Avec `mtime`, toutes les entrées portent cet horodatage et des permissions
+    fixes : deux écritures des mêmes contenus produisent les mêmes octets.
+    """
+
+    def __init__(self, fileobj, archive_format, mtime=None):
+        self.format = FORMATS[archive_format]
+        self.mtime = mtime
+        if self.format.kind == 'zip':
+            # Import différé : zipfile (et lzma, bz2) ne servent qu'à la génération
+            import zipfile
+            self._compression = getattr(zipfile, f'ZIP_{self.format.compression.upper()}')
+            self._zip = zipfile.ZipFile(
+                fileobj, 'w', self._compression, compresslevel=self.format.level
+            )
+        else:
+            if self.format.compression == 'gz':
+                # wbits=31 : flux deflate avec en-tête et pied de page gzip
+                compressor = zlib.compressobj(self.format.level, zlib.DEFLATED, 31)
+            else:
+                import lzma
+                compressor = lzma.LZMACompressor(lzma.FORMAT_XZ, preset=self.format.level)
+            self._sink = _CompressingSink(fileobj, compressor)
+            # Import différé : seuls les formats tar en ont besoin
+            import tarfile
+            self._tar = tarfile.open(fileobj=self._sink, mode='w|', format=tarfile.PAX_FORMAT)
+
+    def add(self, filename, content):
+        """Ajoute un fichier (texte ou octets) à l'archive"""
+        if self.format.kind == 'zip':
+            if self.mtime is None:
+                self._zip.writestr(filename, content)
+                return
+            import zipfile
+            info = zipfile.ZipInfo(filename, date_time=time.gmtime(self.mtime)[:6])
+            info.external_attr = 0o644 << 16
+            self._zip.writestr(info, content, self._compression, self.format.level)
+            return
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        import tarfile
+        info = tarfile.TarInfo(filename)
+        info.size = len(data)
+        info.mtime = int(time.time()) if self.mtime is None else self.mtime
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        if self.format.kind == 'zip':
+            self._zip.close()
+        else:
+            self._tar.close()
+            self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def write_archive(entries, archive_format='zip', mtime=None):
+    """Archive complète, en mémoire, à partir de paires (nom de fichier, contenu)"""
+    buffer = io.BytesIO()
+    with ArchiveWriter(buffer, archive_format, mtime) as writer:
+        for filename, content in entries:
+            writer.add(filename, content)
+    return buffer.getvalue()
@@ -0,0 +1,128 @@
+"""Provisionnement Azure OpenAI : régions et capacité (TPM) des déploiements de modèles.
+
+Azure limite chaque déploiement en jetons par minute (TPM) et en requêtes par
+minute (6 RPM par tranche de 1 000 TPM). La limite est décomptée à l'admission
+de la requête, sur les jetons du prompt plus `max_tokens` : une capacité calculée
+sur la longueur moyenne des réponses provoque des 429 en pointe.
+
+Le compte principal est placé dans la région du groupe de ressources, à côté de
+la base vectorielle ; les régions secondaires, voisines et dans l'UE, répartissent
+la charge de complétion.
+"""
+import math
+from dataclasses import dataclass
+
+from .vectorizers import OPENAI_TPM, QUERY_TOKENS
+
+# Régions de l'UE proposées, et régions voisines pour répartir la charge
+AZURE_REGIONS = ('westeurope', 'francecentral', 'swedencentral', 'northeurope', 'germanywestcentral')
+REGION_NEIGHBOURS = {
+    'westeurope': ('swedencentral', 'francecentral'),
+    'francecentral': ('westeurope', 'swedencentral'),
+    'swedencentral': ('westeurope', 'northeurope'),
+    'northeurope': ('westeurope', 'swedencentral'),
+    'germanywestcentral': ('westeurope', 'swedencentral'),
+}
+REGION_COUNTS = (1, 2, 3)
+
+DEFAULT_REGION = 'westeurope'
+DEFAULT_REGION_COUNT = 1
+# Prompt RAG typique : consignes, question et passages retrouvés
+DEFAULT_PROMPT_TOKENS = 1500
+DEFAULT_COMPLETION_TOKENS = 300
+
+CHAT_MODEL = ('gpt-4o', '2024-08-06')
+# Modèles d'embeddings et dimension maximale : la dimension retenue est demandée au
+# modèle (paramètre `dimensions`), le plus petit modèle qui la permet est déployé
+EMBEDDING_MODELS = (
+    ('text-embedding-3-small', '1', 1536),
+    ('text-embedding-3-large', '1', 3072),
+)
+# Une unité de capacité Standard = 1 000 TPM = 6 RPM
+TOKENS_PER_UNIT = 1000
+RPM_PER_UNIT = 6
+# max_tokens conseillé : deux fois la réponse moyenne, décompté par Azure à l'admission
+MAX_TOKENS_FACTOR = 2
+# Marge pour les rafales : Azure applique la limite sur des fenêtres de quelques secondes
+BURST_HEADROOM = 1.2
+# Quota Standard indicatif d'un modèle par région et par abonnement, en unités
+REGION_QUOTA_UNITS = 450
+
+
+@dataclass(frozen=True, slots=True)
+class Deployment:
+    """Déploiement d'un modèle dans une région, capacité en unités de 1 000 TPM"""
+
+    name: str
+    model: str
+    version: str
+    region: str
+    capacity: int
+
+    @property
+    def rpm(self):
+        return self.capacity * RPM_PER_UNIT
+
+
+@dataclass(frozen=True, slots=True)
+class OpenAIPlan:
+    """Régions et déploiements Azure OpenAI, injectés dans main.tf et le README"""
+
+    region: str
+    secondary_regions: tuple
+    deployments: tuple
+    max_tokens: int
+    tokens_per_minute: int
+    requests_per_minute: int
+
+    @property
+    def chat_capacity(self):
+        return sum(d.capacity for d in self.deployments if d.name == 'chat')
+
+    @property
+    def over_quota(self):
+        return any(d.capacity > REGION_QUOTA_UNITS for d in self.deployments)
+
+    def deployment(self, name):
+        """Déploiement `name` du compte principal, ou None"""
+        return next((d for d in self.deployments if d.name == name and d.region == self.region), None)
+
+
+def embedding_model(embedding_dim):
+    """Modèle d'embeddings (nom, version) qui produit des vecteurs de cette dimension"""
+    for name, version, max_dim in EMBEDDING_MODELS:
+        if embedding_dim <= max_dim:
+            return name, version
+    raise ValueError(f"embedding_dim : {embedding_dim} dépasse la dimension des modèles OpenAI")
+
+
+def plan_openai(target_qps, prompt_tokens, completion_tokens, region, region_count, vectorizer,
+                embedding_dim=1536):
+    """Capacité des déploiements pour le débit de requêtes et la taille des échanges"""
+    max_tokens = completion_tokens * MAX_TOKENS_FACTOR
+    requests_per_minute = math.ceil(target_qps * 60 * BURST_HEADROOM)
+    tokens_per_minute = requests_per_minute * (prompt_tokens + max_tokens)
+    chat_units = max(
+        math.ceil(tokens_per_minute / TOKENS_PER_UNIT),
+        math.ceil(requests_per_minute / RPM_PER_UNIT)
+    )
+    regions = (region,) + REGION_NEIGHBOURS[region][:region_count - 1]
+    per_region = math.ceil(chat_units / len(regions))
+    deployments = [
+        Deployment('chat', CHAT_MODEL[0], CHAT_MODEL[1], r, per_region)
+        for r in regions
+    ]
+    if vectorizer == 'openai':
+        # Embeddings dans la région principale : requêtes et débit d'import du kit
+        query_units = math.ceil(requests_per_minute * QUERY_TOKENS / TOKENS_PER_UNIT)
+        embedding_units = max(query_units, OPENAI_TPM // TOKENS_PER_UNIT)
+        model, version = embedding_model(embedding_dim)
+        deployments.append(Deployment('embedding', model, version, region, embedding_units))
+    return OpenAIPlan(
+        region=region,
+        secondary_regions=regions[1:],
+        deployments=tuple(deployments),
+        max_tokens=max_tokens,
+        tokens_per_minute=tokens_per_minute,
+        requests_per_minute=requests_per_minute,
+    )
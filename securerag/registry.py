@@ -0,0 +1,118 @@
+"""Registre des générateurs d'artefacts : déclaration, chargement à la demande et rendu concurrent.
+
+Chaque générateur déclare le fichier qu'il produit et, s'il est facultatif, la
+condition qui le sélectionne ; les attributs de KitConfig qu'il lit sont ceux de
+ses fragments (voir fragments.Fragment.depends_on). Son module
+n'est importé qu'au premier kit qui le sélectionne : le coût d'import et de rendu
+suit ce que le kit utilise, pas l'ensemble des cibles prises en charge.
+
+Les générateurs ne lisent que la configuration : ils sont indépendants et rendus
+en parallèle (SECURE_RAG_RENDER_WORKERS threads, 1 = rendu séquentiel), les
+résultats étant consommés dans l'ordre déclaré.
+"""
+import functools
+import importlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .metrics import metrics
+
+RENDER_WORKERS = int(os.environ.get('SECURE_RAG_RENDER_WORKERS', 4))
+
+_loaded = {}
+_executor = None
+_executor_pid = None
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class ArtifactGenerator:
+    """Générateur d'un fichier du kit, désigné par 'module:fonction'
+
+    `when`, prédicat sur la configuration, le réserve aux kits qui en ont l'usage.
+    """
+
+    output: str
+    target: str
+    when: object = None
+
+    def selected(self, config):
+        return self.when is None or bool(self.when(config))
+
+    def load(self):
+        """Fonction de génération, importée au premier appel"""
+        function = _loaded.get(self.target)
+        if function is None:
+            module_name, _, name = self.target.partition(':')
+            with metrics.span(f'load.{self.output}'):
+                function = getattr(importlib.import_module(module_name), name)
+            _loaded[self.target] = function
+        return function
+
+    def render(self, config, options):
+        generate = self.load()
+        with metrics.span(f'render.{self.output}'):
+            return generate(config, **options)
+
+
+class GeneratorRegistry:
+    """Générateurs du kit, dans l'ordre d'écriture de l'archive"""
+
+    def __init__(self, generators=()):
+        self._generators = []
+        for generator in generators:
+            self.register(generator)
+
+    def register(self, generator):
+        if any(g.output == generator.output for g in self._generators):
+            raise ValueError(f"artefact déjà déclaré : {generator.output}")
+        self._generators.append(generator)
+        return generator
+
+    def __iter__(self):
+        return iter(self._generators)
+
+    def __len__(self):
+        return len(self._generators)
+
+    def select(self, config):
+        """Générateurs retenus pour cette configuration"""
+        return [g for g in self._generators if g.selected(config)]
+
+
+def _render_executor():
+    """Pool de rendu partagé par le processus, recréé après un fork (génération en lot)"""
+    global _executor, _executor_pid
+    if RENDER_WORKERS <= 1:
+        return None
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix='kit-render')
+            _executor_pid = os.getpid()
+        return _executor
+
+
+class _Deferred:
+    """Rendu séquentiel, exécuté au premier appel de result() (interface de Future)"""
+
+    def __init__(self, render):
+        self._render = render
+
+    def result(self):
+        return self._render()
+
+    def cancel(self):
+        return True
+
+
+def render_all(generators, config, **options):
+    """Lance le rendu des générateurs ; renvoie pour chacun un Future de son contenu
+
+    `cancel()` abandonne un rendu pas encore commencé (kit interrompu en cours de flux).
+    """
+    executor = _render_executor()
+    if executor is None:
+        return [_Deferred(functools.partial(g.render, config, options)) for g in generators]
+    return [executor.submit(g.render, config, options) for g in generators]
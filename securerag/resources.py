@@ -0,0 +1,50 @@
+"""Ressources partagées par toutes les sessions du processus : plafonds mémoire et empreinte.
+
+Chaque cache partagé s'inscrit ici avec une fonction `stats()` renvoyant au moins
+`entries` et, quand la taille est connue, `bytes` / `max_bytes`. Les plafonds se
+règlent par variables d'environnement : SECURE_RAG_<NOM>_MAX_MB et
+SECURE_RAG_<NOM>_MAX_ENTRIES (par exemple SECURE_RAG_KIT_CACHE_MAX_MB).
+"""
+import os
+import threading
+
+from .metrics import metrics
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+_registry = {}
+_lock = threading.Lock()
+
+
+def limit_bytes(name, default_mb):
+    """Plafond mémoire (en octets) de la ressource `name`"""
+    return int(os.environ.get(f'SECURE_RAG_{name.upper()}_MAX_MB', default_mb)) * 1024 * 1024
+
+
+def limit_entries(name, default):
+    """Nombre maximal d'entrées de la ressource `name`"""
+    return int(os.environ.get(f'SECURE_RAG_{name.upper()}_MAX_ENTRIES', default))
+
+
+def register(name, stats):
+    """Inscrit une ressource partagée ; ses statistiques sont aussi exportées en jauges"""
+    with _lock:
+        _registry[name] = stats
+    metrics.register_gauges(name, stats)
+
+
+def footprint():
+    """Empreinte courante de chaque ressource partagée et total connu en octets"""
+    with _lock:
+        providers = dict(_registry)
+    resources = {name: stats() for name, stats in providers.items()}
+    return {
+        'resources': resources,
+        'total_bytes': sum(stats.get('bytes', 0) for stats in resources.values()),
+    }
+
+
+def read_static(filename):
+    """Contenu d'un fichier statique du paquet (feuille de style...)"""
+    with open(os.path.join(STATIC_DIR, filename), encoding='utf-8') as f:
+        return f.read()
@@ -0,0 +1,381 @@
+"""Service HTTP asynchrone de génération de kits, indépendant de l'interface Streamlit.
+
+    python -m securerag.service --port 8080 --workers 4
+    uvicorn securerag.service:create_app --factory --port 8080
+
+Points d'accès (l'identifiant d'un job est la clé de sa KitConfig) :
+- POST /kits : génère le kit de la configuration JSON et renvoie l'archive en flux,
+  au fil de la compression des artefacts (ou depuis le cache s'il y est déjà) ;
+  avec `Prefer: respond-async` ou `?async=1`, répond 202 avec l'état du job
+- GET /kits/{id} : état et progression du job (`?wait=<secondes>` attend sa fin)
+- GET /kits/{id}/archive : archive du kit
+- DELETE /kits/{id} : abandonne le job (annulé quand son dernier demandeur l'abandonne)
+- GET /healthz, GET /metrics
+
+Les archives connues (cache, jobs terminés) portent un ETag fort (SHA-256 du contenu)
+et `If-None-Match` donne un 304 ; une archive diffusée pendant sa génération n'en a
+pas, son contenu n'étant connu qu'à la fin. Le pool est borné : au-delà de SECURE_RAG_SERVICE_MAX_PENDING générations
+en vol, les nouvelles demandes reçoivent un 503 avec Retry-After.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from . import resources
+from .cache import create_kit_cache, kit_key
+from .config import KitConfig
+from .engine import precompile
+from .jobs import KitJobManager, Saturated
+from .metrics import metrics
+from .packaging import FORMATS, kit_digest
+
+CHUNK_SIZE = 64 * 1024
+# Morceaux d'archive produits d'avance pour un client lent
+STREAM_BUFFER = 8
+# Borne de l'attente d'un GET /kits/{id}?wait=...
+MAX_WAIT_SECONDS = 30.0
+
+
+def _etag_matches(header, etag):
+    """Vrai si l'en-tête If-None-Match désigne l'ETag courant"""
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+
+
+def _chunks(data):
+    view = memoryview(data)
+    for start in range(0, len(view), CHUNK_SIZE):
+        yield bytes(view[start:start + CHUNK_SIZE])
+
+
+async def _wait(job, timeout=None):
+    """Attend la fin d'un job sans bloquer la boucle ni l'annuler si la requête est abandonnée"""
+    if not job.done():
+        await asyncio.wait([asyncio.wrap_future(job.future)], timeout=timeout)
+    return job.done()
+
+
+def _error(status_code, message, headers=None):
+    return JSONResponse({'error': message}, status_code=status_code, headers=headers)
+
+
+class KitStream:
+    """Archive générée sur le pool de KitJobManager, consommée par une réponse en flux
+
+    Le producteur attend quand le tampon est plein (client lent) et s'arrête dès
+    que la réponse est fermée (client déconnecté).
+    """
+
+    def __init__(self, manager, config):
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=STREAM_BUFFER)
+        self._closed = threading.Event()
+        self.future = manager.execute(self._produce, config)
+
+    def _put(self, item):
+        """Transmet un morceau à la boucle ; False si la réponse a été fermée entre-temps"""
+        future = asyncio.run_coroutine_threadsafe(self._queue.put(item), self._loop)
+        while not self._closed.is_set():
+            try:
+                future.result(timeout=0.1)
+                return True
+            except TimeoutError:
+                continue
+        future.cancel()
+        return False
+
+    def _produce(self, config):
+        if self._closed.is_set():
+            return
+        # Import différé : jinja2 et le moteur de gabarits ne sont chargés qu'à la première génération
+        from .generator import iter_secure_kit
+        chunks = iter_secure_kit(config)
+        try:
+            for chunk in chunks:
+                if not self._put(chunk):
+                    return
+            self._put(None)
+        except Exception as e:
+            self._put(e)
+        finally:
+            chunks.close()
+
+    async def next(self):
+        """Morceau suivant, None en fin d'archive ; lève l'erreur de génération"""
+        item = await self._queue.get()
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def close(self):
+        self._closed.set()
+
+
+class KitService:
+    """État du service : pool de génération et jobs asynchrones récents"""
+
+    def __init__(self, manager, max_jobs=256, retry_after=1):
+        self.manager = manager
+        self.max_jobs = max_jobs
+        self.retry_after = retry_after
+        # Jobs soumis en mode asynchrone, du plus ancien au plus récent, et nombre de
+        # demandeurs de chacun : le job n'est abandonné qu'au dernier DELETE
+        self._jobs = OrderedDict()
+        self._subscribers = {}
+        # Générations diffusées en flux (POST synchrone), comptées avec les jobs du pool
+        self._streams = 0
+        self._streams_lock = threading.Lock()
+
+    def stats(self):
+        return {'entries': len(self._jobs), 'max_entries': self.max_jobs}
+
+    async def _read_config(self, request):
+        try:
+            return KitConfig.from_dict(await request.json())
+        except json.JSONDecodeError:
+            raise ValueError("corps JSON invalide")
+        except (AttributeError, TypeError):
+            raise ValueError("la configuration doit être un objet JSON")
+
+    def _saturated(self, exc):
+        metrics.increment('service_rejected')
+        return _error(503, f"service saturé : {exc}", headers={'Retry-After': str(self.retry_after)})
+
+    def _track(self, job, subscribers=1):
+        """Conserve un job asynchrone ; le plus ancien est abandonné au-delà de `max_jobs`"""
+        self._jobs.pop(job.key, None)
+        self._jobs[job.key] = job
+        self._subscribers[job.key] = subscribers
+        while len(self._jobs) > self.max_jobs:
+            key, evicted = self._jobs.popitem(last=False)
+            del self._subscribers[key]
+            self.manager.release(evicted)
+
+    def _status(self, job):
+        status = job.status()
+        status['config'] = job.config.to_dict()
+        status['status_url'] = f"/kits/{job.key}"
+        status['archive_url'] = f"/kits/{job.key}/archive"
+        return status
+
+    def _archive(self, request, config, data):
+        """Réponse de téléchargement, ou 304 si le client possède déjà ce contenu"""
+        etag = f'"{kit_digest(data)}"'
+        if _etag_matches(request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers={'ETag': etag})
+        archive_format = FORMATS[config.archive]
+        headers = {
+            'ETag': etag,
+            'Content-Length': str(len(data)),
+            'Content-Disposition': f'attachment; filename="{archive_format.filename("secure-rag-kit")}"',
+        }
+        return StreamingResponse(_chunks(data), media_type=archive_format.mime, headers=headers)
+
+    def _reserve_stream(self):
+        """Réserve une génération en flux ; lève Saturated au-delà de max_pending générations en vol
+
+        Les générations en flux partagent le pool de KitJobManager : au-delà de
+        `workers`, elles attendent un worker comme les jobs asynchrones.
+        """
+        with self._streams_lock:
+            in_flight = self.manager.running() + self._streams
+            if self.manager.max_pending is not None and in_flight >= self.manager.max_pending:
+                raise Saturated(f"{in_flight} générations en cours")
+            self._streams += 1
+
+    def _release_stream(self):
+        with self._streams_lock:
+            self._streams -= 1
+
+    async def _stream(self, config, first, stream):
+        """Diffuse l'archive au fil de sa génération, puis la met en cache si elle y tient"""
+        cache = self.manager.cache
+        parts, size = [first], len(first)
+        try:
+            yield first
+            while (chunk := await stream.next()) is not None:
+                if parts is not None:
+                    parts.append(chunk)
+                    size += len(chunk)
+                    if size > cache.max_bytes:
+                        parts = None
+                yield chunk
+            if parts is not None:
+                cache.put(kit_key(config), b''.join(parts))
+        finally:
+            # Client déconnecté : la génération s'arrête avec le flux
+            stream.close()
+            self._release_stream()
+
+    async def _generate(self, request, config):
+        """Réponse du POST synchrone : kit en cache, sinon archive diffusée pendant sa génération"""
+        data = self.manager.cache.get(kit_key(config))
+        if data is not None:
+            return self._archive(request, config, data)
+        try:
+            self._reserve_stream()
+        except Saturated as e:
+            return self._saturated(e)
+        stream = KitStream(self.manager, config)
+        try:
+            # Premier morceau avant les en-têtes : un échec précoce reste une erreur 500
+            first = await stream.next()
+        except Exception as e:
+            stream.close()
+            self._release_stream()
+            return _error(500, f"la génération du kit a échoué : {e}")
+        if first is None:
+            stream.close()
+            self._release_stream()
+            return _error(500, "la génération du kit a produit une archive vide")
+        metrics.increment('service_streams')
+        archive_format = FORMATS[config.archive]
+        headers = {
+            'Content-Disposition': f'attachment; filename="{archive_format.filename("secure-rag-kit")}"',
+        }
+        return StreamingResponse(self._stream(config, first, stream), media_type=archive_format.mime, headers=headers)
+
+    async def create_kit(self, request):
+        try:
+            config = await self._read_config(request)
+        except ValueError as e:
+            return _error(400, str(e))
+
+        respond_async = (
+            request.query_params.get('async') in ('1', 'true')
+            or 'respond-async' in request.headers.get('prefer', '')
+        )
+        if respond_async:
+            job = self._jobs.get(config.key)
+            if job is None or job.cancelled() or job.exception() is not None:
+                try:
+                    retry = self.manager.submit(config)
+                except Saturated as e:
+                    return self._saturated(e)
+                # Un job en échec est relancé ; ses demandeurs suivent le nouveau job
+                subscribers = 1
+                if job is not None:
+                    subscribers += self._subscribers[job.key]
+                    if not job.cancelled():
+                        self.manager.release(job)
+                job = retry
+                self._track(job, subscribers)
+            else:
+                self._subscribers[job.key] += 1
+            return JSONResponse(self._status(job), status_code=202, headers={'Location': f"/kits/{job.key}"})
+
+        return await self._generate(request, config)
+
+    async def get_kit(self, request):
+        job = self._jobs.get(request.path_params['key'])
+        if job is None:
+            return _error(404, "job inconnu ou expiré")
+        try:
+            timeout = min(float(request.query_params.get('wait', 0)), MAX_WAIT_SECONDS)
+        except ValueError:
+            return _error(400, "wait : nombre de secondes attendu")
+        if timeout > 0:
+            await _wait(job, timeout)
+        return JSONResponse(self._status(job))
+
+    async def get_archive(self, request):
+        job = self._jobs.get(request.path_params['key'])
+        if job is None:
+            return _error(404, "job inconnu ou expiré")
+        if job.cancelled():
+            return _error(410, "job annulé")
+        if not job.done():
+            return JSONResponse(self._status(job), status_code=409)
+        if job.exception() is not None:
+            return _error(500, f"la génération du kit a échoué : {job.exception()}")
+        return self._archive(request, job.config, job.result())
+
+    async def delete_kit(self, request):
+        key = request.path_params['key']
+        job = self._jobs.get(key)
+        if job is None:
+            return _error(404, "job inconnu ou expiré")
+        # Les autres demandeurs de la même configuration gardent le job
+        self._subscribers[key] -= 1
+        if self._subscribers[key] == 0:
+            del self._jobs[key], self._subscribers[key]
+            self.manager.release(job)
+        return Response(status_code=204)
+
+    async def healthz(self, request):
+        return JSONResponse({
+            'status': 'ok',
+            'workers': self.manager.max_workers,
+            'running': self.manager.running(),
+            'streams': self._streams,
+            'max_pending': self.manager.max_pending,
+            'jobs': len(self._jobs),
+        })
+
+    async def export_metrics(self, request):
+        return PlainTextResponse(metrics.to_prometheus(), media_type='text/plain; version=0.0.4')
+
+
+def create_app(workers=None, max_pending=None, max_jobs=None):
+    """Application ASGI du service ; réglages par défaut issus de l'environnement"""
+    workers = workers or int(os.environ.get('SECURE_RAG_SERVICE_WORKERS', 4))
+    if max_pending is None:
+        max_pending = int(os.environ.get('SECURE_RAG_SERVICE_MAX_PENDING', workers * 4))
+    manager = KitJobManager(create_kit_cache(), max_workers=workers, max_pending=max_pending)
+    metrics.register_gauges('kit_jobs', lambda: {'running': manager.running()})
+    service = KitService(manager, max_jobs=max_jobs or resources.limit_entries('service_jobs', 256))
+    resources.register('service_jobs', service.stats)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        precompile()
+        yield
+        manager.shutdown(wait=False)
+
+    app = Starlette(
+        routes=[
+            Route('/kits', service.create_kit, methods=['POST']),
+            Route('/kits/{key}', service.get_kit, methods=['GET']),
+            Route('/kits/{key}', service.delete_kit, methods=['DELETE']),
+            Route('/kits/{key}/archive', service.get_archive, methods=['GET']),
+            Route('/healthz', service.healthz, methods=['GET']),
+            Route('/metrics', service.export_metrics, methods=['GET']),
+        ],
+        lifespan=lifespan
+    )
+    app.state.service = service
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Service HTTP de génération de kits Secure RAG")
+    parser.add_argument('--host', default='127.0.0.1', help="Adresse d'écoute (défaut : 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8080, help="Port d'écoute (défaut : 8080)")
+    parser.add_argument(
+        '--workers', type=int, default=None,
+        help="Threads de génération (défaut : SECURE_RAG_SERVICE_WORKERS ou 4)"
+    )
+    parser.add_argument(
+        '--max-pending', type=int, default=None,
+        help="Générations en vol avant refus en 503 (défaut : SECURE_RAG_SERVICE_MAX_PENDING ou 4 x workers)"
+    )
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    uvicorn.run(create_app(args.workers, args.max_pending), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
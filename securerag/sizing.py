@@ -0,0 +1,174 @@
+"""Dimensionnement de Weaviate : mémoire, CPU et réglages HNSW à partir de la charge attendue.
+
+Ordres de grandeur tirés des recommandations Weaviate : l'index en mémoire occupe
+environ deux fois la taille des vecteurs (marge du ramasse-miettes Go comprise),
+plus le graphe HNSW dont la couche 0 porte 2 x maxConnections liens par objet.
+Quand les vecteurs ne tiennent pas dans la mémoire d'un nœud, on les quantifie :
+PQ (1 octet par segment) d'abord, BQ (1 bit par dimension) si PQ ne suffit pas.
+
+En topologie `cluster`, l'index est réparti en shards dont chaque nœud porte une
+réplique : nœuds = shards x facteur de réplication.
+"""
+import math
+from dataclasses import dataclass
+
+# Image épinglée : une version testée plutôt que `latest`
+WEAVIATE_IMAGE = 'cr.weaviate.io/semitechnologies/weaviate:1.26.6'
+
+# Valeurs proposées par le wizard
+DEFAULT_CORPUS_SIZE = 100_000
+DEFAULT_EMBEDDING_DIM = 1536
+DEFAULT_TARGET_QPS = 10
+DEFAULT_LATENCY_MS = 100
+DEFAULT_NODE_MEMORY_GB = 16
+DEFAULT_TOPOLOGY = 'single'
+DEFAULT_REPLICATION_FACTOR = 1
+TOPOLOGIES = ('single', 'cluster')
+REPLICATION_FACTORS = (1, 2, 3)
+EMBEDDING_DIMS = (384, 768, 1024, 1536, 3072)
+LATENCY_TARGETS_MS = (20, 50, 100, 200, 500)
+NODE_MEMORY_GB = (4, 8, 16, 32, 64, 128)
+
+GIB = 1024 ** 3
+# Mémoire de base du processus (modules, caches, goroutines)
+BASE_MEMORY_BYTES = GIB // 2
+# Part de la limite du conteneur accordée au tas Go (GOMEMLIMIT)
+GOMEMLIMIT_RATIO = 0.9
+# Coût d'un calcul de distance par dimension en float32 (SIMD), en nanosecondes
+DISTANCE_NS_PER_DIM = 0.25
+# Marge CPU pour les pics de requêtes et l'indexation en tâche de fond
+CPU_HEADROOM = 1.5
+# ef de recherche selon l'objectif de latence (ms) : plus de latence, plus de rappel
+LATENCY_EF = ((20, 64), (50, 128), (100, 256), (200, 384))
+MAX_EF = 512
+# Objets servant à entraîner les centroïdes PQ
+PQ_TRAINING_LIMIT = 100_000
+# Taille maximale d'un shard, au-delà la construction du graphe HNSW devient trop longue
+MAX_OBJECTS_PER_SHARD = 20_000_000
+# Nœuds votants du consensus Raft (schéma) : nombre impair, 3 au plus
+MAX_RAFT_VOTERS = 3
+# Plafonds : au-delà, le compose et les ports des nœuds (8080 + n) ne tiennent plus
+MAX_CORPUS_SIZE = 100_000_000
+MAX_NODES = 128
+
+
+@dataclass(frozen=True, slots=True)
+class Sizing:
+    """Réglages et estimations d'un nœud Weaviate, injectés dans les gabarits du kit"""
+
+    ef: int
+    ef_construction: int
+    max_connections: int
+    # 'none', 'pq' ou 'bq'
+    quantization: str
+    pq_segments: int
+    pq_training_limit: int
+    memory_bytes: int
+    memory_limit_gb: int
+    cpus: int
+    # Nœuds déployés, et nœuds qu'exigerait l'index sans réplication
+    nodes: int
+    nodes_required: int
+    query_ms: float
+    latency_ms: int
+    topology: str = DEFAULT_TOPOLOGY
+    shards: int = 1
+    replication_factor: int = 1
+    image: str = WEAVIATE_IMAGE
+
+    @property
+    def gomemlimit(self):
+        return f"{int(self.memory_limit_gb * 1024 * GOMEMLIMIT_RATIO)}MiB"
+
+    @property
+    def memory_gb(self):
+        return round(self.memory_bytes / GIB, 1)
+
+    @property
+    def latency_ok(self):
+        return self.query_ms <= self.latency_ms
+
+    @property
+    def raft_voters(self):
+        """Noms de cluster des nœuds votants"""
+        voters = min(self.nodes, MAX_RAFT_VOTERS)
+        if voters % 2 == 0:
+            voters -= 1
+        return tuple(f"node{i}" for i in range(voters))
+
+
+def pq_segments(embedding_dim):
+    """Nombre de segments PQ : un segment pour environ 4 dimensions, diviseur de la dimension"""
+    return next(s for s in range(max(1, embedding_dim // 4), 0, -1) if embedding_dim % s == 0)
+
+
+def estimate(corpus_size, embedding_dim, target_qps, latency_ms, node_memory_gb,
+             topology=DEFAULT_TOPOLOGY, replication_factor=DEFAULT_REPLICATION_FACTOR):
+    """Calcule les réglages HNSW, la quantification, la topologie et les ressources par nœud"""
+    max_connections = 16 if corpus_size < 1_000_000 else 32 if corpus_size < 10_000_000 else 64
+    ef = next((ef for limit, ef in LATENCY_EF if latency_ms <= limit), MAX_EF)
+    ef_construction = max(128, min(2 * ef, MAX_EF))
+
+    graph_bytes = corpus_size * max_connections * 2 * 8
+    budget = node_memory_gb * GIB
+    segments = pq_segments(embedding_dim)
+
+    def memory_for(vector_bytes):
+        return 2 * vector_bytes + graph_bytes + BASE_MEMORY_BYTES
+
+    # Octets par vecteur en mémoire et coût d'une distance (ns) selon la quantification
+    candidates = (
+        ('none', embedding_dim * 4, embedding_dim * DISTANCE_NS_PER_DIM),
+        ('pq', segments, segments * 1.0),
+        ('bq', math.ceil(embedding_dim / 8), math.ceil(embedding_dim / 64) * 1.0),
+    )
+    for quantization, vector_size, distance_ns in candidates:
+        memory = memory_for(corpus_size * vector_size)
+        if memory <= budget:
+            break
+    nodes_required = max(1, math.ceil(memory / budget))
+
+    if topology == 'cluster':
+        # Chaque nœud porte une réplique d'un shard : nœuds = shards x réplication
+        shards = max(
+            math.ceil(max(2, replication_factor) / replication_factor),
+            nodes_required,
+            math.ceil(corpus_size / MAX_OBJECTS_PER_SHARD)
+        )
+        nodes = shards * replication_factor
+        if nodes > MAX_NODES:
+            raise ValueError(
+                f"topologie : {nodes} nœuds nécessaires, au plus {MAX_NODES} ; augmentez la mémoire par nœud"
+            )
+        node_memory = memory / shards
+    else:
+        nodes, shards, replication_factor = 1, 1, 1
+        node_memory = memory
+
+    # Couche 0 : ef candidats explorés, 2 x maxConnections voisins évalués chacun ;
+    # avec quantification, les ef meilleurs candidats sont réévalués en pleine précision
+    distances_ns = ef * 2 * max_connections * distance_ns
+    if quantization != 'none':
+        distances_ns += ef * embedding_dim * DISTANCE_NS_PER_DIM
+    query_ms = round(distances_ns / 1e6, 2)
+    # Une requête interroge une réplique de chaque shard, réparties sur les nœuds
+    cpus = max(2, math.ceil(target_qps * shards / nodes * query_ms / 1000 * CPU_HEADROOM) + 1)
+
+    return Sizing(
+        ef=ef,
+        ef_construction=ef_construction,
+        max_connections=max_connections,
+        quantization=quantization,
+        pq_segments=segments,
+        pq_training_limit=min(PQ_TRAINING_LIMIT, corpus_size),
+        memory_bytes=memory,
+        memory_limit_gb=min(node_memory_gb, max(1, math.ceil(node_memory / GIB))),
+        cpus=cpus,
+        nodes=nodes,
+        nodes_required=nodes_required,
+        query_ms=query_ms,
+        latency_ms=latency_ms,
+        topology=topology,
+        shards=shards,
+        replication_factor=replication_factor,
+    )
@@ -0,0 +1,40 @@
+"""Résumé de configuration affiché au récapitulatif, sans dépendance au moteur de gabarits."""
+from .labels import OBJECTIVE_SUMMARIES
+
+
+def generate_config_summary(config):
+    """Génère le résumé de la configuration affiché au récapitulatif"""
+    summary = "🎯 Configuration personnalisée :\n\n"
+    
+    summary += OBJECTIVE_SUMMARIES.get(config.objective, '') + '\n'
+    
+    data_types = config.data_types
+    if 'personal' in data_types:
+        summary += '✅ Protection données personnelles (RGPD)\n'
+    if 'financial' in data_types:
+        summary += '✅ Conformité financière renforcée\n'
+    
+    security = config.security_level
+    if 'encryption' in security:
+        summary += '✅ Chiffrement bout-en-bout activé\n'
+    if 'sso' in security:
+        summary += '✅ Authentification SSO configurée\n'
+    if 'audit' in security:
+        summary += '✅ Journalisation complète des accès\n'
+    
+    sizing = config.sizing
+    summary += f'✅ Weaviate dimensionné : {sizing.nodes} x {sizing.cpus} vCPU / {sizing.memory_limit_gb} Go\n'
+    if sizing.quantization != 'none':
+        summary += f'✅ Quantification {sizing.quantization.upper()} des vecteurs\n'
+    if config.inference.vectorizer == 'transformers':
+        summary += '✅ Vectorisation locale sur CPU, sans appel sortant\n'
+    plan = config.openai_plan
+    regions = len(plan.secondary_regions) + 1
+    summary += f'✅ Azure OpenAI provisionné : {plan.chat_capacity}k TPM de complétion sur {regions} région(s)\n'
+    if config.response_cache:
+        scope = ' par utilisateur' if config.response_cache.scope == 'user' else ''
+        summary += f'✅ Cache des réponses et des embeddings{scope}\n'
+    
+    summary += '\n✅ Configuration sécurisée prête pour déploiement'
+    
+    return summary
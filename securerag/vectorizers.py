@@ -0,0 +1,99 @@
+"""Vectorisation : module Weaviate, conteneur d'inférence local et débits attendus.
+
+`openai` appelle l'API à chaque import et à chaque requête : le débit d'import est
+plafonné par le quota (jetons par minute) et chaque requête paie un aller-retour
+réseau. `transformers` embarque un modèle multilingue sur CPU dans le kit : aucun
+appel sortant, débit proportionnel aux vCPU alloués, fonctionnement hors ligne.
+Un cache HTTP (nginx) devant l'inférence évite de revectoriser un texte déjà vu ;
+avec des données personnelles, il reste en mémoire (tmpfs) et expire vite, ses clés
+contenant le texte vectorisé.
+"""
+import math
+from dataclasses import dataclass
+
+from .ingestion import CHUNKING, PII_DATA
+
+VECTORIZERS = ('openai', 'transformers')
+DEFAULT_VECTORIZER = 'openai'
+
+# Modèle multilingue (français compris), 384 dimensions
+TRANSFORMERS_IMAGE = (
+    'cr.weaviate.io/semitechnologies/transformers-inference:'
+    'sentence-transformers-paraphrase-multilingual-MiniLM-L12-v2'
+)
+TRANSFORMERS_DIM = 384
+CACHE_IMAGE = 'nginx:1.27-alpine'
+CACHE_SIZE_MB = 2048
+# Durée de vie des embeddings en cache (s) ; données personnelles : tmpfs borné, TTL court
+CACHE_TTL = 30 * 86_400
+PERSONAL_CACHE_SIZE_MB = 256
+PERSONAL_CACHE_TTL = 900
+
+# Quota de référence d'un déploiement d'embeddings OpenAI (jetons par minute)
+OPENAI_TPM = 350_000
+# Aller-retour vers l'API d'embeddings, ajouté à chaque requête
+OPENAI_QUERY_MS = 150
+TRANSFORMERS_QUERY_MS = 15
+# Débit CPU du modèle : passages de 128 jetons par seconde et par vCPU
+PASSAGES_PER_VCPU = 40
+CHARS_PER_TOKEN = 4
+# Longueur typique d'une requête utilisateur, en jetons
+QUERY_TOKENS = 32
+INFERENCE_CPUS = 4
+INFERENCE_MEMORY_GB = 3
+# Marge des répliques d'inférence sur la charge de requêtes
+INFERENCE_HEADROOM = 2
+
+
+@dataclass(frozen=True, slots=True)
+class Inference:
+    """Vectorisation retenue, ressources d'inférence et débits estimés"""
+
+    vectorizer: str
+    module: str
+    modules: str
+    # Lots d'import : petits pour l'inférence locale, qui traite chaque lot d'un bloc
+    batch_size: int
+    passages_per_second: int
+    query_ms: int
+    replicas: int = 0
+    cpus: int = 0
+    memory_gb: int = 0
+    image: str = TRANSFORMERS_IMAGE
+    cache_image: str = CACHE_IMAGE
+    cache_size_mb: int = CACHE_SIZE_MB
+    cache_ttl: int = CACHE_TTL
+    # Cache sur volume ; sinon en mémoire (tmpfs), perdu au redémarrage
+    cache_persistent: bool = True
+
+
+def plan_inference(vectorizer, objective, target_qps, data_types=()):
+    """Dimensionne la vectorisation pour l'objectif (taille des passages) et la charge de requêtes"""
+    tokens = max(1, CHUNKING.get(objective, CHUNKING['search'])[0] // CHARS_PER_TOKEN)
+    if vectorizer == 'openai':
+        return Inference(
+            vectorizer='openai',
+            module='text2vec-openai',
+            modules='text2vec-openai,qna-openai',
+            batch_size=100,
+            passages_per_second=max(1, OPENAI_TPM // 60 // tokens),
+            query_ms=OPENAI_QUERY_MS,
+        )
+    per_replica = max(1, INFERENCE_CPUS * PASSAGES_PER_VCPU * 128 // tokens)
+    queries_per_replica = INFERENCE_CPUS * PASSAGES_PER_VCPU * 128 // QUERY_TOKENS
+    replicas = max(1, math.ceil(target_qps * INFERENCE_HEADROOM / queries_per_replica))
+    personal = bool(PII_DATA.intersection(data_types))
+    return Inference(
+        vectorizer='transformers',
+        module='text2vec-transformers',
+        modules='text2vec-transformers',
+        batch_size=32,
+        passages_per_second=per_replica * replicas,
+        query_ms=TRANSFORMERS_QUERY_MS,
+        replicas=replicas,
+        cpus=INFERENCE_CPUS,
+        memory_gb=INFERENCE_MEMORY_GB,
+        cache_size_mb=PERSONAL_CACHE_SIZE_MB if personal else CACHE_SIZE_MB,
+        cache_ttl=PERSONAL_CACHE_TTL if personal else CACHE_TTL,
+        cache_persistent=not personal,
+    )
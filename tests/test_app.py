@@ -0,0 +1,47 @@
+"""Parcours de app.py via le harnais AppTest de Streamlit."""
+import os
+
+from streamlit.testing.v1 import AppTest
+
+import securerag.generator
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+def _summary_app(objective, data_types):
+    """Application positionnée sur le récapitulatif d'une configuration"""
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    at.session_state['current_step'] = 6
+    at.session_state['objective'] = objective
+    at.session_state['data_types'] = dict.fromkeys(data_types, True)
+    at.session_state['security_level'] = {'audit': True}
+    return at.run()
+
+
+def _click(at, label):
+    for button in at.button:
+        if button.label.startswith(label):
+            return button.click().run()
+    raise AssertionError(f"bouton introuvable : {label}")
+
+
+def test_retry_after_failure_calls_generator_again(monkeypatch):
+    generate = securerag.generator.generate_secure_kit
+    calls = []
+
+    def flaky(config, on_progress=None):
+        calls.append(config.key)
+        if len(calls) == 1:
+            raise RuntimeError("panne simulée")
+        return generate(config, on_progress=on_progress)
+
+    monkeypatch.setattr(securerag.generator, 'generate_secure_kit', flaky)
+    # Configuration propre au test : le kit n'est pas déjà dans le cache partagé
+    at = _summary_app('analysis', ('legal', 'technical'))
+    assert at.session_state.kit_job.wait(30)
+    assert at.session_state.kit_job.exception() is not None
+
+    at = _click(at, "🚀 Générer")
+    assert not at.exception
+    assert len(calls) == 2
+    assert at.session_state.current_step == 8
@@ -0,0 +1,46 @@
+"""Artefacts du kit : cohérence entre Terraform, Weaviate et le README."""
+import json
+
+import pytest
+import yaml
+
+from securerag.artifacts.azure import generate_terraform_config
+from securerag.artifacts.rag_cache import generate_rag_cache
+from securerag.artifacts.scripts import generate_loadtest_script
+from securerag.artifacts.weaviate import generate_weaviate_config, generate_weaviate_schema
+from securerag.config import KitConfig
+
+
+def kit_config(vectorizer):
+    return KitConfig(objective='search', data_types=('technical',), security_level=('sso',), vectorizer=vectorizer)
+
+
+def test_openai_vectorizer_targets_the_azure_deployment():
+    config = kit_config('openai')
+    environment = yaml.safe_load(generate_weaviate_config(config))['services']['weaviate']['environment']
+    assert 'AZURE_APIKEY' in environment and 'OPENAI_APIKEY' not in environment
+
+    module_config = json.loads(generate_weaviate_schema(config))['moduleConfig']['text2vec-openai']
+    assert module_config['resourceName'] == '${AZURE_OPENAI_RESOURCE}'
+    # Nom du déploiement d'embeddings créé par main.tf
+    assert f'name                 = "{module_config["deploymentId"]}"' in generate_terraform_config(config)
+    assert 'output "openai_resource_name"' in generate_terraform_config(config)
+
+
+def test_local_vectorizer_needs_no_azure_key():
+    config = kit_config('transformers')
+    environment = yaml.safe_load(generate_weaviate_config(config))['services']['weaviate']['environment']
+    assert 'AZURE_APIKEY' not in environment
+    assert 'moduleConfig' not in json.loads(generate_weaviate_schema(config))
+
+
+@pytest.mark.parametrize('dim, model', [(768, 'text-embedding-3-small'), (3072, 'text-embedding-3-large')])
+def test_openai_dimension_reaches_every_artifact(dim, model):
+    config = KitConfig(objective='search', data_types=('technical',), security_level=('sso',),
+                       vectorizer='openai', embedding_dim=dim)
+    module_config = json.loads(generate_weaviate_schema(config))['moduleConfig']['text2vec-openai']
+    assert module_config['dimensions'] == dim
+    assert module_config['deploymentId'] == model
+    assert f'name    = "{model}"' in generate_terraform_config(config)
+    assert f'EMBEDDING_DIM = {dim}\n' in generate_rag_cache(config)
+    assert f'EMBEDDING_DIM = {dim}\n' in generate_loadtest_script(config)
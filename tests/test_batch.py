@@ -0,0 +1,19 @@
+"""Génération en lot : erreurs de manifeste signalées par la ligne de commande."""
+import pytest
+
+from securerag.batch import main
+
+
+@pytest.mark.parametrize('manifest, message', [
+    ('- objective: search\n- search\n', 'entrée 2 : objet attendu'),
+    ('configs:\n  - objective: search\n  - [search]\n', 'entrée 2 : objet attendu'),
+    ('- objective: search\n- objective: inconnu\n', 'entrée 2 : objective'),
+    ('search\n', 'manifeste illisible'),
+])
+def test_invalid_manifest_entries_are_reported(tmp_path, capsys, manifest, message):
+    path = tmp_path / 'manifest.yaml'
+    path.write_text(manifest, encoding='utf-8')
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(path), '-o', str(tmp_path / 'kits')])
+    assert exit_info.value.code == 2
+    assert message in capsys.readouterr().err
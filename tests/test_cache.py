@@ -0,0 +1,50 @@
+"""Cache de kits : éviction LRU en mémoire et niveau disque borné."""
+import os
+
+from securerag.cache import KitCache, kit_key
+from securerag.config import KitConfig
+
+CONFIG = KitConfig(objective='synthesis', data_types=('legal',), security_level=('rbac',))
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = KitCache(max_entries=2, max_bytes=1024)
+    cache.put('a', b'1')
+    cache.put('b', b'2')
+    assert cache.get('a') == b'1'
+    cache.put('c', b'3')
+    assert cache.get('b') is None
+    assert cache.get('a') == b'1' and cache.get('c') == b'3'
+    assert cache.stats()['evictions'] == 1
+
+
+def test_disk_tier_is_capped_in_bytes(tmp_path):
+    cache = KitCache(max_entries=1, disk_dir=str(tmp_path), max_disk_bytes=10)
+    cache.put('a.zip', b'x' * 4)
+    cache.put('b.zip', b'x' * 4)
+    # Lecture de a : b devient le moins récemment lu
+    cache.clear()
+    assert cache.get('a.zip') == b'x' * 4
+    cache.put('c.tar.gz', b'x' * 4)
+    assert sorted(os.listdir(tmp_path)) == ['a.zip', 'c.tar.gz']
+    assert cache.stats()['disk_bytes'] == 8
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    KitCache(disk_dir=str(tmp_path)).put('a.zip', b'kit')
+    cache = KitCache(disk_dir=str(tmp_path), max_disk_bytes=10)
+    assert cache.stats()['disk_entries'] == 1
+    assert cache.get('a.zip') == b'kit'
+    assert cache.stats()['disk_hits'] == 1
+
+
+def test_kit_key_follows_format_and_timestamp_policy(monkeypatch):
+    monkeypatch.delenv('SECURE_RAG_REPRODUCIBLE', raising=False)
+    assert kit_key(CONFIG).endswith('.zip')
+    assert kit_key(KitConfig.from_dict(dict(CONFIG.to_dict(), archive='tar.xz'))).endswith('.tar.xz')
+
+    monkeypatch.setenv('SECURE_RAG_REPRODUCIBLE', '1')
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    reproducible = kit_key(CONFIG)
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1800000000')
+    assert kit_key(CONFIG) != reproducible
@@ -0,0 +1,70 @@
+"""Client du service de génération : resoumission et erreurs HTTP."""
+import pytest
+import requests
+
+from securerag.client import RemoteKitJobManager
+from securerag.config import KitConfig
+
+CONFIG = KitConfig('search', ('hr',), ('sso',))
+
+
+def _response(status_code, json=None, content=b''):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = 'http://service/kits'
+    response._content = content if json is None else requests.compat.json.dumps(json).encode()
+    return response
+
+
+class FakeService(RemoteKitJobManager):
+    """Réponses préparées, consommées dans l'ordre, par (méthode, chemin)"""
+
+    def __init__(self, responses):
+        super().__init__('http://service')
+        self.responses = responses
+        self.calls = []
+
+    def request(self, method, path, **kwargs):
+        self.calls.append((method, path))
+        return self.responses[(method, path)].pop(0)
+
+
+def _done():
+    return _response(202, {'state': 'done', 'stage': 'Kit prêt', 'progress': 1.0})
+
+
+def test_result_resubmits_when_archive_expired():
+    archive = f'/kits/{CONFIG.key}/archive'
+    service = FakeService({
+        ('post', '/kits'): [_done(), _done()],
+        ('get', archive): [_response(404, {'error': 'job inconnu ou expiré'}), _response(200, content=b'kit')],
+    })
+    job = service.submit(CONFIG)
+    assert job.result(5) == b'kit'
+    assert service.calls.count(('post', '/kits')) == 2
+
+
+def test_result_reports_http_errors_as_job_failure():
+    service = FakeService({
+        ('post', '/kits'): [_done()],
+        ('get', f'/kits/{CONFIG.key}/archive'): [_response(500, {'error': 'panne'})],
+    })
+    job = service.submit(CONFIG)
+    with pytest.raises(RuntimeError, match='service de génération'):
+        job.result(5)
+    assert job.done()
+    assert job.exception() is not None
+
+
+def test_release_deletes_only_held_subscriptions():
+    delete = ('delete', f'/kits/{CONFIG.key}')
+    service = FakeService({
+        ('post', '/kits'): [_response(503), _done()],
+        delete: [_response(204)],
+    })
+    # Refusé par le service (503) : aucune inscription à abandonner
+    service.release(service.submit(CONFIG))
+    job = service.submit(CONFIG)
+    service.release(job)
+    service.release(job)
+    assert service.calls.count(delete) == 1
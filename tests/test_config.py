@@ -0,0 +1,45 @@
+"""KitConfig : validation, forme canonique et clé de contenu."""
+import pytest
+
+from securerag.config import KitConfig
+
+BASE = {'objective': 'synthesis', 'data_types': ['legal'], 'security_level': ['rbac']}
+
+
+def test_key_ignores_order_and_duplicates():
+    config = KitConfig.from_dict(BASE)
+    reordered = KitConfig.from_dict(dict(BASE, data_types=['legal', 'legal'], security_level=['rbac']))
+    assert config.key == reordered.key
+    assert KitConfig.from_dict(config.to_dict()) == config
+
+
+def test_key_changes_with_options():
+    config = KitConfig.from_dict(BASE)
+    assert KitConfig.from_dict(dict(BASE, data_types=['legal', 'personal'])).key != config.key
+    assert KitConfig.from_dict(dict(BASE, archive='tar.gz')).key != config.key
+
+
+@pytest.mark.parametrize('data_types', ['legal', b'legal', 3, [['legal']]])
+def test_non_list_values_are_rejected(data_types):
+    with pytest.raises(ValueError, match='data_types'):
+        KitConfig.from_dict(dict(BASE, data_types=data_types))
+
+
+@pytest.mark.parametrize('changes', [
+    {'objective': 'inconnu'},
+    {'data_types': ['inconnu']},
+    {'corpus_size': 0},
+    {'corpus_size': 10 ** 11, 'topology': 'cluster'},
+    {'target_qps': 'beaucoup'},
+    {'archive': 'rar'},
+])
+def test_invalid_values_are_rejected(changes):
+    with pytest.raises(ValueError):
+        KitConfig.from_dict(dict(BASE, **changes))
+
+
+def test_derived_attributes():
+    config = KitConfig.from_dict(dict(BASE, data_types=['personal'], security_level=['sso']))
+    assert config.gdpr_relevant
+    assert not config.anonymous_access
+    assert not KitConfig.from_dict(BASE).gdpr_relevant
@@ -0,0 +1,57 @@
+"""Fragments : cache des blocs rendus, réutilisés tant que leurs dépendances ne changent pas."""
+import pytest
+
+import securerag.fragments
+from securerag.artifacts.azure import generate_terraform_config
+from securerag.artifacts.readme import generate_readme
+from securerag.config import KitConfig
+from securerag.fragments import fragment_cache
+
+CONFIG = KitConfig('search', ('technical',), ('sso',))
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """Templates réellement rendus (hors cache), dans l'ordre"""
+    fragment_cache.clear()
+    names = []
+    render = securerag.fragments.render_template
+
+    def counting_render(name, **context):
+        names.append(name)
+        return render(name, **context)
+
+    monkeypatch.setattr(securerag.fragments, 'render_template', counting_render)
+    yield names
+    fragment_cache.clear()
+
+
+def test_unchanged_config_is_served_from_cache(rendered):
+    first = generate_terraform_config(CONFIG)
+    assert len(rendered) == len(set(rendered)) > 1
+    rendered.clear()
+    hits = fragment_cache.stats()['hits']
+
+    assert generate_terraform_config(KitConfig('search', ('technical',), ('sso',))) == first
+    assert rendered == []
+    assert fragment_cache.stats()['hits'] > hits
+
+
+def test_changed_option_rerenders_only_its_fragments(rendered):
+    generate_terraform_config(CONFIG)
+    rendered.clear()
+    encrypted = KitConfig('search', ('technical',), ('sso', 'encryption'))
+    text = generate_terraform_config(encrypted)
+    # Seul le coffre de clés dépend de encryption_at_rest
+    assert rendered == ['terraform/key_vault.tf.j2']
+
+    fragment_cache.clear()
+    assert generate_terraform_config(encrypted) == text
+
+
+def test_call_values_are_part_of_the_key(rendered):
+    monday = generate_readme(CONFIG, generated_at='01/01/2024 à 09:00')
+    rendered.clear()
+    tuesday = generate_readme(CONFIG, generated_at='02/01/2024 à 09:00')
+    assert rendered == ['readme/footer.md.j2']
+    assert '02/01/2024' in tuesday and '02/01/2024' not in monday
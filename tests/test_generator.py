@@ -0,0 +1,52 @@
+"""Génération en flux : mêmes octets que l'archive complète, arrêt à la fermeture."""
+import threading
+
+import pytest
+
+from securerag import registry
+from securerag.config import KitConfig
+from securerag.generator import KIT_ARTIFACTS, generate_secure_kit, iter_secure_kit
+from securerag.packaging import FORMATS
+from securerag.registry import ArtifactGenerator
+
+CONFIG = KitConfig('search', ('personal',), ('sso', 'rbac'))
+
+
+@pytest.mark.parametrize('name', FORMATS)
+def test_streamed_chunks_join_into_the_kit(name):
+    config = KitConfig('search', ('personal',), ('sso', 'rbac'), archive=name)
+    chunks = list(iter_secure_kit(config, reproducible=True))
+    assert len(chunks) > 1
+    assert b''.join(chunks) == generate_secure_kit(config, reproducible=True)
+
+
+def test_closing_the_stream_stops_generation(monkeypatch):
+    """Les rendus en attente sont abandonnés et les étapes suivantes ne sont pas lancées"""
+    outputs = [g.output for g in KIT_ARTIFACTS.select(CONFIG)]
+    started, steps = [], []
+    go = threading.Event()
+    render = ArtifactGenerator.render
+
+    def slow_render(self, config, options):
+        started.append(self.output)
+        # Le premier artefact passe, les autres occupent les threads de rendu
+        if self.output != outputs[0]:
+            go.wait(10)
+        return render(self, config, options)
+
+    monkeypatch.setattr(ArtifactGenerator, 'render', slow_render)
+    stream = iter_secure_kit(CONFIG, on_progress=lambda step, done, total: steps.append(done),
+                             reproducible=True)
+    try:
+        assert next(stream)
+        stream.close()
+    finally:
+        go.set()
+    executor = registry._render_executor()
+    if executor is not None:
+        # Tous les threads de rendu au rendez-vous : les tâches soumises avant sont terminées
+        barrier = threading.Barrier(registry.RENDER_WORKERS)
+        for done in [executor.submit(barrier.wait) for _ in range(registry.RENDER_WORKERS)]:
+            done.result(10)
+    assert steps == [0]
+    assert outputs[-1] not in started
@@ -0,0 +1,96 @@
+"""Pool de génération partagé : abonnements, annulation et contre-pression."""
+import threading
+import time
+
+import pytest
+
+import securerag.generator
+from securerag.cache import KitCache
+from securerag.config import KitConfig
+from securerag.jobs import KitJobManager, Saturated
+
+
+@pytest.fixture
+def blocked(monkeypatch):
+    """Générateur qui attend le feu vert ; le premier job occupe donc le worker"""
+    go = threading.Event()
+
+    def generate(config, on_progress=None):
+        go.wait(10)
+        return config.key.encode()
+
+    monkeypatch.setattr(securerag.generator, 'generate_secure_kit', generate)
+    yield go
+    go.set()
+
+
+def _config(objective='search'):
+    return KitConfig(objective, ('hr',), ('sso',))
+
+
+def test_same_config_shares_one_job(blocked):
+    manager = KitJobManager(KitCache(), max_workers=1)
+    first = manager.submit(_config())
+    second = manager.submit(_config())
+    assert first is second
+    assert first.subscribers == 2
+    blocked.set()
+    assert first.result(5) == _config().key.encode()
+    manager.shutdown()
+
+
+def test_release_cancels_pending_job_without_subscribers(blocked):
+    manager = KitJobManager(KitCache(), max_workers=1)
+    manager.submit(_config('analysis'))
+    job = manager.submit(_config())
+    manager.release(job)
+    assert job.cancelled()
+    assert manager.running() == 1
+    blocked.set()
+    manager.shutdown()
+
+
+def test_saturated_beyond_max_pending(blocked):
+    manager = KitJobManager(KitCache(), max_workers=1, max_pending=1)
+    manager.submit(_config('analysis'))
+    with pytest.raises(Saturated):
+        manager.submit(_config())
+    blocked.set()
+    manager.shutdown()
+
+
+def test_concurrent_release_and_submit_never_join_a_cancelled_job(blocked):
+    manager = KitJobManager(KitCache(), max_workers=1)
+    # Le worker reste occupé : le job mesuré ne démarre jamais et reste annulable
+    manager.submit(_config('analysis'))
+    config = _config()
+    job = manager.submit(config)
+    # Annulation ralentie : submit arrive pendant que release annule le job
+    cancel = job.future.cancel
+    cancelling = threading.Event()
+
+    def slow_cancel():
+        cancelling.set()
+        time.sleep(0.1)
+        return cancel()
+
+    job.future.cancel = slow_cancel
+    releaser = threading.Thread(target=manager.release, args=(job,))
+    releaser.start()
+    cancelling.wait(5)
+    joined = manager.submit(config)
+    releaser.join()
+    assert job.cancelled()
+    assert joined is not job
+    assert not joined.cancelled()
+    blocked.set()
+    assert joined.result(5) == config.key.encode()
+    manager.shutdown()
+
+
+def test_cold_generation_counts_one_miss():
+    cache = KitCache()
+    manager = KitJobManager(cache, max_workers=1)
+    manager.submit(KitConfig('synthesis', ('legal',), ('rbac',))).result(30)
+    assert (cache.stats()['misses'], cache.stats()['hits']) == (1, 0)
+    manager.shutdown()
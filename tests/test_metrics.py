@@ -0,0 +1,18 @@
+"""Métriques : export Prometheus et point d'accès de scraping."""
+import urllib.request
+
+from securerag.metrics import Metrics, serve
+
+
+def test_scraping_endpoint_is_local_by_default():
+    metrics = Metrics(enabled=True)
+    metrics.increment('kits_generated')
+    server = serve(metrics, 0)
+    try:
+        host, port = server.server_address
+        assert host == '127.0.0.1'
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics') as response:
+            assert 'kits_generated' in response.read().decode('utf-8')
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,82 @@
+"""Empaquetage : relecture de chaque format et archives reproductibles d'un processus à l'autre."""
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from securerag.config import KitConfig
+from securerag.generator import generate_secure_kit
+from securerag.packaging import FORMATS, kit_digest, write_archive
+
+ROOT = Path(__file__).resolve().parents[1]
+SOURCE_DATE_EPOCH = '1700000000'
+
+ENTRIES = (
+    ('README.md', "# Kit\n\nAccents : éàü\n"),
+    ('scripts/ingest.py', "print('ok')\n" * 500),
+    ('data.bin', bytes(range(256)) * 4),
+)
+
+# Empreinte de chaque format, calculée dans un autre interpréteur
+DIGESTS_SCRIPT = """
+import json
+from securerag.config import KitConfig
+from securerag.generator import generate_secure_kit
+from securerag.packaging import FORMATS, kit_digest, write_archive
+print(json.dumps({
+    name: kit_digest(generate_secure_kit(
+        KitConfig('search', ('personal',), ('sso', 'rbac'), archive=name), reproducible=True
+    ))
+    for name in FORMATS
+}))
+"""
+
+
+def read_archive(data, name):
+    """Contenu de l'archive relu avec la bibliothèque standard : {nom : octets}"""
+    if FORMATS[name].kind == 'zip':
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.testzip() is None
+            return {info.filename: archive.read(info) for info in archive.infolist()}
+    with tarfile.open(fileobj=io.BytesIO(data), mode='r:*') as archive:
+        return {member.name: archive.extractfile(member).read() for member in archive.getmembers()}
+
+
+@pytest.mark.parametrize('name', FORMATS)
+@pytest.mark.parametrize('mtime', [None, 315532800])
+def test_archive_round_trip(name, mtime):
+    data = write_archive(ENTRIES, name, mtime)
+    expected = {filename: content.encode('utf-8') if isinstance(content, str) else content
+                for filename, content in ENTRIES}
+    members = read_archive(data, name)
+    assert list(members) == [filename for filename, _ in ENTRIES]
+    assert members == expected
+
+
+@pytest.fixture(scope='module')
+def other_process_digests():
+    """Empreintes d'un second processus : autre graine de hachage, autre fuseau horaire"""
+    env = dict(os.environ, SOURCE_DATE_EPOCH=SOURCE_DATE_EPOCH, PYTHONHASHSEED='1234', TZ='Pacific/Auckland',
+               PYTHONPATH=str(ROOT))
+    output = subprocess.run([sys.executable, '-c', DIGESTS_SCRIPT], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+@pytest.mark.parametrize('name', FORMATS)
+def test_reproducible_kit_is_identical_across_processes(name, other_process_digests, monkeypatch):
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', SOURCE_DATE_EPOCH)
+    config = KitConfig('search', ('personal',), ('sso', 'rbac'), archive=name)
+    first = kit_digest(generate_secure_kit(config, reproducible=True))
+    # Le lendemain, le même kit
+    tomorrow = time.time() + 86400
+    monkeypatch.setattr(time, 'time', lambda: tomorrow)
+    assert kit_digest(generate_secure_kit(config, reproducible=True)) == first
+    assert other_process_digests[name] == first
@@ -0,0 +1,177 @@
+"""Module rag_cache.py du kit, exécuté contre un faux serveur RESP : cloisonnement et effacement."""
+import fnmatch
+import importlib.util
+import math
+import re
+import socketserver
+import threading
+from array import array
+
+import pytest
+
+from securerag.artifacts.rag_cache import generate_rag_cache
+from securerag.config import KitConfig
+
+PII_CONFIG = KitConfig(objective='search', data_types=('personal',), security_level=('rbac',))
+
+
+class FakeRedis(socketserver.ThreadingTCPServer):
+    """Sous-ensemble de Redis utilisé par rag_cache.py, index vectoriel compris (sans TTL)"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeRedisHandler)
+        self.strings = {}
+        self.hashes = {}
+        self.lock = threading.Lock()
+
+    def execute(self, name, args):
+        if name in ('AUTH', 'EXPIRE', 'FT.CREATE'):
+            return 'OK'
+        if name == 'GET':
+            return self.strings.get(args[0])
+        if name == 'SET':
+            self.strings[args[0]] = args[1]
+            return 'OK'
+        if name == 'HGET':
+            return self.hashes.get(args[0], {}).get(args[1])
+        if name == 'HSET':
+            self.hashes.setdefault(args[0], {}).update(zip(args[1::2], args[2::2]))
+            return len(args) // 2
+        if name == 'SCAN':
+            pattern = args[args.index(b'MATCH') + 1].decode()
+            keys = [k for k in list(self.strings) + list(self.hashes) if fnmatch.fnmatchcase(k.decode(), pattern)]
+            return [b'0', keys]
+        if name == 'UNLINK':
+            return sum(self.strings.pop(k, None) is not None or self.hashes.pop(k, None) is not None for k in args)
+        if name == 'FT.SEARCH':
+            return self.search(args)
+        raise ValueError(f"commande non simulée : {name}")
+
+    def search(self, args):
+        """KNN 1 sur les réponses du scope demandé"""
+        scope = re.search(rb'@scope:\{(\w+)\}', args[1]).group(1)
+        query = array('f', args[args.index(b'vec') + 1]).tolist()
+        best = None
+        for key, fields in self.hashes.items():
+            if fields.get(b'scope') != scope or b'embedding' not in fields:
+                continue
+            vector = array('f', fields[b'embedding']).tolist()
+            similarity = sum(a * b for a, b in zip(query, vector)) / (
+                math.hypot(*query) * math.hypot(*vector))
+            if best is None or 1 - similarity < best[0]:
+                best = (1 - similarity, key, fields[b'answer'])
+        if best is None:
+            return [0]
+        distance, key, answer = best
+        return [1, key, [b'answer', answer, b'distance', str(distance).encode()]]
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            size = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def encode(self, value):
+        if value is None:
+            return b'$-1\r\n'
+        if isinstance(value, str):
+            return b'+%s\r\n' % value.encode()
+        if isinstance(value, int):
+            return b':%d\r\n' % value
+        if isinstance(value, bytes):
+            return b'$%d\r\n%s\r\n' % (len(value), value)
+        return b'*%d\r\n' % len(value) + b''.join(self.encode(item) for item in value)
+
+    def handle(self):
+        while (command := self.read_command()) is not None:
+            with self.server.lock:
+                reply = self.server.execute(command[0].decode().upper(), command[1:])
+            self.wfile.write(self.encode(reply))
+
+
+@pytest.fixture(scope='module')
+def rag_cache(tmp_path_factory):
+    """Module rag_cache.py d'un kit à données personnelles"""
+    path = tmp_path_factory.mktemp('kit') / 'rag_cache.py'
+    path.write_text(generate_rag_cache(PII_CONFIG), encoding='utf-8')
+    spec = importlib.util.spec_from_file_location('kit_rag_cache', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def cache(rag_cache):
+    server = FakeRedis()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield rag_cache.RagCache(f"redis://127.0.0.1:{server.server_address[1]}")
+    server.shutdown()
+    server.server_close()
+
+
+def vector(rag_cache, seed):
+    return [float((i * seed) % 7 + 1) for i in range(rag_cache.EMBEDDING_DIM)]
+
+
+def test_entries_are_scoped_per_user(rag_cache, cache):
+    assert rag_cache.SCOPE == 'user'
+    question = vector(rag_cache, 3)
+    cache.store("Mon salaire ?", question, "3 000 €", user='alice')
+
+    assert cache.lookup("mon  salaire ?", question, user='alice') == "3 000 €"
+    # Même question, même embedding : ni réponse exacte ni sémantique pour un autre utilisateur
+    assert cache.lookup("Mon salaire ?", question, user='bob') is None
+    assert cache.counts == {'exact': 1, 'semantic': 0, 'miss': 1, 'embedding_hit': 0, 'embedding_miss': 0}
+    with pytest.raises(ValueError):
+        cache.lookup("Mon salaire ?", question)
+
+
+def test_semantic_match_stays_in_scope(rag_cache, cache):
+    question = vector(rag_cache, 3)
+    cache.store("Mon salaire ?", question, "3 000 €", user='alice')
+    assert cache.lookup("Quel est mon salaire ?", question, user='alice') == "3 000 €"
+    assert cache.counts['semantic'] == 1
+
+
+def test_embeddings_are_scoped_per_user(rag_cache, cache):
+    calls = []
+
+    def embed(question):
+        calls.append(question)
+        return vector(rag_cache, 5)
+
+    cache.embedding("Mes congés ?", embed, user='alice')
+    cache.embedding("Mes congés ?", embed, user='alice')
+    cache.embedding("Mes congés ?", embed, user='bob')
+    assert len(calls) == 2
+
+
+def test_forget_erases_one_user(rag_cache, cache):
+    question = vector(rag_cache, 3)
+    cache.store("Mon salaire ?", question, "3 000 €", user='alice')
+    cache.store("Mon salaire ?", question, "2 500 €", user='bob')
+    cache.embedding("Mon salaire ?", lambda q: question, user='alice')
+
+    assert cache.forget('alice') == 2
+    assert cache.lookup("Mon salaire ?", user='alice') is None
+    assert cache.lookup("Mon salaire ?", user='bob') == "2 500 €"
+
+
+def test_unreachable_cache_fails_open(rag_cache):
+    with socketserver.TCPServer(('127.0.0.1', 0), socketserver.BaseRequestHandler) as closed:
+        port = closed.server_address[1]
+    cache = rag_cache.RagCache(f"redis://127.0.0.1:{port}")
+    assert cache.lookup("Mon salaire ?", user='alice') is None
+    cache.store("Mon salaire ?", None, "3 000 €", user='alice')
+    question = vector(rag_cache, 2)
+    assert cache.embedding("Mon salaire ?", lambda q: question, user='alice') == question
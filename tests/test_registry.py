@@ -0,0 +1,61 @@
+"""Registre des générateurs : sélection par prédicat et import à la demande."""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from securerag.config import KitConfig
+from securerag.generator import KIT_ARTIFACTS
+from securerag.registry import ArtifactGenerator, GeneratorRegistry
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules d'artefacts importés après chaque étape, dans un interpréteur neuf
+LAZY_SCRIPT = """
+import json, sys
+from securerag.config import KitConfig
+from securerag.generator import generate_secure_kit
+
+def artifacts():
+    return sorted(name for name in sys.modules if name.startswith('securerag.artifacts.'))
+
+steps = {'import': artifacts()}
+generate_secure_kit(KitConfig('synthesis', ('technical',), ('sso',)))
+steps['synthesis'] = artifacts()
+generate_secure_kit(KitConfig('search', ('technical',), ('sso',)))
+steps['search'] = artifacts()
+print(json.dumps(steps))
+"""
+
+
+@pytest.mark.parametrize('objective, cached', [
+    ('search', True), ('assistant', True), ('synthesis', False), ('analysis', False),
+])
+def test_rag_cache_is_selected_for_cached_objectives(objective, cached):
+    outputs = [g.output for g in KIT_ARTIFACTS.select(KitConfig(objective, ('technical',), ('sso',)))]
+    assert ('rag_cache.py' in outputs) is cached
+    # Les autres artefacts sont toujours présents, dans l'ordre déclaré
+    assert [o for o in outputs if o != 'rag_cache.py'] == [
+        g.output for g in KIT_ARTIFACTS if g.when is None
+    ]
+
+
+def test_duplicate_output_is_rejected():
+    registry = GeneratorRegistry([ArtifactGenerator('a.txt', 'module:a')])
+    with pytest.raises(ValueError, match='a.txt'):
+        registry.register(ArtifactGenerator('a.txt', 'module:b'))
+
+
+def test_generators_are_imported_on_first_use():
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    output = subprocess.run([sys.executable, '-c', LAZY_SCRIPT], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    steps = json.loads(output)
+    assert steps['import'] == []
+    assert 'securerag.artifacts.azure' in steps['synthesis']
+    # Un kit sans cache de réponses n'importe pas son générateur
+    assert 'securerag.artifacts.rag_cache' not in steps['synthesis']
+    assert 'securerag.artifacts.rag_cache' in steps['search']
@@ -0,0 +1,103 @@
+"""Service HTTP de génération : jobs asynchrones partagés et téléchargement."""
+import io
+import threading
+import zipfile
+
+import pytest
+from starlette.testclient import TestClient
+
+from securerag.service import create_app
+
+CONFIG = {'objective': 'synthesis', 'data_types': ['legal'], 'security_level': ['rbac']}
+
+
+@pytest.fixture
+def client():
+    with TestClient(create_app(workers=2)) as client:
+        yield client
+
+
+def test_sync_post_streams_then_serves_from_cache(client):
+    # Premier POST : archive diffusée pendant sa génération, sans ETag
+    response = client.post('/kits', json=CONFIG)
+    assert response.status_code == 200
+    assert 'etag' not in response.headers
+    assert 'README.md' in zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+
+    # Second POST : même archive, servie depuis le cache avec son ETag
+    cached = client.post('/kits', json=CONFIG)
+    assert cached.status_code == 200
+    assert cached.content == response.content
+    assert client.post('/kits', json=CONFIG, headers={'If-None-Match': cached.headers['etag']}).status_code == 304
+
+
+def test_sync_post_reports_early_failure(client, monkeypatch):
+    def broken(config, **options):
+        raise RuntimeError("gabarit introuvable")
+
+    monkeypatch.setattr('securerag.artifacts.azure.generate_terraform_config', broken)
+    monkeypatch.setattr('securerag.registry._loaded', {})
+    response = client.post('/kits', json=dict(CONFIG, data_types=['technical']))
+    assert response.status_code == 500
+    assert 'gabarit introuvable' in response.json()['error']
+    assert client.get('/healthz').json()['streams'] == 0
+
+
+def test_invalid_config_is_rejected(client):
+    assert client.post('/kits', json={'objective': 'inconnu'}).status_code == 400
+    assert client.post('/kits', content=b'{').status_code == 400
+    oversized = {'objective': 'search', 'corpus_size': 10 ** 11, 'topology': 'cluster'}
+    assert client.post('/kits', json=oversized).status_code == 400
+
+
+def test_delete_keeps_job_for_other_requesters(client):
+    first = client.post('/kits?async=1', json=CONFIG)
+    second = client.post('/kits?async=1', json=CONFIG)
+    assert first.status_code == second.status_code == 202
+    key = first.json()['id']
+    assert second.json()['id'] == key
+
+    # Le premier demandeur abandonne : le second suit toujours son job
+    assert client.delete(f'/kits/{key}').status_code == 204
+    assert client.get(f'/kits/{key}', params={'wait': 10}).json()['state'] == 'done'
+    assert client.get(f'/kits/{key}/archive').status_code == 200
+
+    assert client.delete(f'/kits/{key}').status_code == 204
+    assert client.get(f'/kits/{key}').status_code == 404
+
+
+def test_failed_async_job_is_resubmitted(client, monkeypatch):
+    calls = []
+
+    def flaky(config, **options):
+        calls.append(config.key)
+        if len(calls) == 1:
+            raise RuntimeError("panne passagère")
+        return original(config, **options)
+
+    from securerag.artifacts import azure
+    original = azure.generate_terraform_config
+    monkeypatch.setattr(azure, 'generate_terraform_config', flaky)
+    monkeypatch.setattr('securerag.registry._loaded', {})
+    config = dict(CONFIG, data_types=['hr'])
+
+    key = client.post('/kits?async=1', json=config).json()['id']
+    assert client.get(f'/kits/{key}', params={'wait': 10}).json()['state'] == 'failed'
+    # Le job en échec garde un demandeur : un nouveau POST relance pourtant la génération
+    client.post('/kits?async=1', json=config)
+    assert client.get(f'/kits/{key}', params={'wait': 10}).json()['state'] == 'done'
+    assert len(calls) == 2
+
+
+def test_sync_stream_runs_on_the_generation_pool(client, monkeypatch):
+    threads = []
+
+    def fake_kit(config, **options):
+        threads.append(threading.current_thread().name)
+        yield b'PK'
+        yield b'fin'
+
+    monkeypatch.setattr('securerag.generator.iter_secure_kit', fake_kit)
+    response = client.post('/kits', json=dict(CONFIG, data_types=['financial']))
+    assert response.content == b'PKfin'
+    assert threads[0].startswith('kit-job')
@@ -0,0 +1,53 @@
+"""Dimensionnement Weaviate : quantification, topologie et réglages HNSW."""
+import pytest
+
+from securerag.sizing import (
+    EMBEDDING_DIMS, MAX_CORPUS_SIZE, MAX_NODES, NODE_MEMORY_GB, REPLICATION_FACTORS, estimate, pq_segments
+)
+
+
+@pytest.mark.parametrize('dim', EMBEDDING_DIMS)
+def test_pq_segments_divide_the_dimension(dim):
+    segments = pq_segments(dim)
+    assert dim % segments == 0
+    assert segments <= dim // 4
+
+
+def test_quantization_follows_memory_pressure():
+    assert estimate(100_000, 1536, 10, 100, 16).quantization == 'none'
+    assert estimate(5_000_000, 1536, 10, 100, 8).quantization == 'pq'
+    assert estimate(50_000_000, 1536, 10, 100, 16).quantization == 'bq'
+
+
+def test_latency_target_drives_ef():
+    fast = estimate(100_000, 1536, 10, 20, 16)
+    slow = estimate(100_000, 1536, 10, 500, 16)
+    assert fast.ef < slow.ef
+    assert fast.ef_construction >= 128
+
+
+def test_single_topology_ignores_replication():
+    sizing = estimate(100_000, 1536, 10, 100, 16, 'single', 3)
+    assert (sizing.nodes, sizing.shards, sizing.replication_factor) == (1, 1, 1)
+
+
+def test_cluster_nodes_are_shards_times_replicas():
+    sizing = estimate(50_000_000, 1536, 100, 100, 16, 'cluster', 3)
+    assert sizing.nodes == sizing.shards * 3
+    assert sizing.shards >= sizing.nodes_required
+    assert sizing.memory_limit_gb <= 16
+    assert len(sizing.raft_voters) in (1, 3)
+
+
+def test_largest_corpus_fits_the_node_cap():
+    # Toute saisie acceptée par KitConfig doit rester sous le plafond de nœuds
+    for memory_gb in NODE_MEMORY_GB:
+        sizing = estimate(MAX_CORPUS_SIZE, max(EMBEDDING_DIMS), 10, 100, memory_gb,
+                          'cluster', max(REPLICATION_FACTORS))
+        assert sizing.nodes <= MAX_NODES
+        assert 8080 + sizing.nodes <= 65535
+
+
+def test_too_many_nodes_are_rejected():
+    with pytest.raises(ValueError, match='nœuds'):
+        estimate(10 * MAX_CORPUS_SIZE, 1536, 10, 100, 4, 'cluster', 3)